@@ -6,8 +6,11 @@ import logging
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.httpx_client import get_async_client
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.httpx_client import (
+    create_async_httpx_client,
+    get_async_client,
+)
 
 from .gateway_reader import GatewayReader
 from .coordinator import GatewayReaderUpdateCoordinator
@@ -18,11 +21,31 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Config entry keys of version 1 that are no longer used.
+OBSOLETE_V1_KEYS = frozenset({
+    "token_raw",
+    "use_token_cache",
+    "token_cache_filepath",
+    "single_inverter_entities",
+})
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Enphase Gateway from a config entry."""
     host = entry.data[CONF_HOST]
-    reader = GatewayReader(host, get_async_client(hass, verify_ssl=False))
+    # The Enlighten session cookies must not be shared with other
+    # integrations or entries, so every entry gets its own client.
+    enlighten_client = create_async_httpx_client(
+        hass, auto_cleanup=False, timeout=10.0
+    )
+    reader = GatewayReader(
+        host,
+        get_async_client(hass, verify_ssl=False),
+        enlighten_client,
+    )
+    # Also runs if the setup fails, so the reader is always released.
+    entry.async_on_unload(enlighten_client.aclose)
+    entry.async_on_unload(reader.aclose)
     coordinator = GatewayReaderUpdateCoordinator(hass, reader, entry)
 
     await coordinator.async_config_entry_first_refresh()
@@ -35,6 +58,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     entry.async_on_unload(entry.add_update_listener(update_listener))
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+
+    @callback
+    def _async_remove_coordinator() -> None:
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+
+    entry.async_on_unload(_async_remove_coordinator)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
@@ -47,10 +76,7 @@ async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    unload = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-    if unload:
-        hass.data[DOMAIN].pop(entry.entry_id)
-    return unload
+    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
 async def async_migrate_entry(
@@ -58,17 +84,16 @@ async def async_migrate_entry(
         config_entry: ConfigEntry,
 ) -> bool:
     """Migrate old entry."""
-    _LOGGER.debug(f"Migrating from version {config_entry.version}")
+    _LOGGER.debug("Migrating from version %s", config_entry.version)
 
     if config_entry.version == 1:
-
-        new = {**config_entry.data}
-
-        # Remove unwanted variables
-        new.pop("token_raw", None)
-        new.pop("use_token_cache", None)
-        new.pop("token_cache_filepath", None)
-        new.pop("single_inverter_entities", None)
+        data = config_entry.data
+        # Remove unwanted variables, only copy the data if there are any.
+        if not OBSOLETE_V1_KEYS.isdisjoint(data):
+            data = {
+                key: val for key, val in data.items()
+                if key not in OBSOLETE_V1_KEYS
+            }
 
         options = {
             CONF_INVERTERS: "gateway_sensor",
@@ -78,10 +103,10 @@ async def async_migrate_entry(
         config_entry.version = 2
         hass.config_entries.async_update_entry(
             config_entry,
-            data=new,
+            data=data,
             options=options
         )
 
-    _LOGGER.info("Migration to version {config_entry.version} successful")
+    _LOGGER.info("Migration to version %s successful", config_entry.version)
 
     return True
@@ -1,6 +1,8 @@
 """Home assistant binary sensors for the Enphase gateway integration."""
 
-from homeassistant.core import HomeAssistant
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -71,6 +73,9 @@ class EnvoyGridStatusEntity(CoordinatorEntity, BinarySensorEntity):
         self._device_name = device_name
         self._device_serial_number = device_serial_number
         CoordinatorEntity.__init__(self, coordinator)
+        self._attr_unique_id = self._get_unique_id()
+        self._attr_device_info = self._get_device_info()
+        self._attr_is_on = self._get_is_on()
 
     @property
     def icon(self):
@@ -82,17 +87,16 @@ class EnvoyGridStatusEntity(CoordinatorEntity, BinarySensorEntity):
         """Return the name of the sensor."""
         return self._name
 
-    @property
-    def unique_id(self):
+    def _get_unique_id(self) -> str | None:
         """Return the unique id of the sensor."""
         if self._serial_number:
             return self._serial_number
         if self._device_serial_number:
             uid = f"{self._device_serial_number}_{self.entity_description.key}"
             return uid
+        return None
 
-    @property
-    def device_info(self) -> DeviceInfo or None:
+    def _get_device_info(self) -> DeviceInfo | None:
         """Return the device_info of the device."""
         if not self._device_serial_number:
             return None
@@ -103,7 +107,12 @@ class EnvoyGridStatusEntity(CoordinatorEntity, BinarySensorEntity):
             name=self._device_name,
         )
 
-    @property
-    def is_on(self) -> bool:
+    def _get_is_on(self) -> bool:
         """Return the status of the requested attribute."""
         return self.coordinator.data.get("grid_status") == "closed"
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the cached status and write the state."""
+        self._attr_is_on = self._get_is_on()
+        self.async_write_ha_state()
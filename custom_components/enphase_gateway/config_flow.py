@@ -17,6 +17,7 @@ from homeassistant.const import (
     CONF_HOST,
     CONF_NAME,
     CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
     CONF_USERNAME,
 )
 
@@ -25,7 +26,7 @@ from .exceptions import CannotConnect
 from .const import (
     DOMAIN, CONF_SERIAL_NUM, CONF_CACHE_TOKEN, CONF_USE_LEGACY_NAME,
     CONF_ENCHARGE_ENTITIES, CONFIG_FLOW_USER_ERROR, CONF_INVERTERS,
-    ALLOWED_ENDPOINTS,
+    ALLOWED_ENDPOINTS, DEFAULT_SCAN_INTERVAL,
 )
 
 
@@ -33,20 +34,101 @@ _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_TITLE = "Enphase Gateway"
 LEGACY_TITLE = "Envoy"
+DEFAULT_TITLES = frozenset({DEFAULT_TITLE, LEGACY_TITLE})
 
 
-async def validate_input(
+def _error_code(exception_class: type[Exception]) -> str:
+    """Return the snake case error code of the exception class."""
+    return "_".join(
+        re.split("(?<=.)(?=[A-Z])", exception_class.__name__)
+    ).lower()
+
+
+# Error codes of the expected errors by exception class.
+ERROR_CODES = {cls: _error_code(cls) for cls in CONFIG_FLOW_USER_ERROR}
+ERROR_CODES[CannotConnect] = "cannot_connect"
+
+
+def _get_error_code(err: Exception) -> str | None:
+    """Return the error code of err or None if err is unexpected.
+
+    Subclasses of the user errors get the error code of their closest
+    base class in ERROR_CODES.
+
+    """
+    for cls in type(err).__mro__:
+        if (error_code := ERROR_CODES.get(cls)) is not None:
+            return error_code
+    return None
+
+
+INVERTERS_SELECTOR = selector(
+    {
+        "select": {
+            "translation_key": CONF_INVERTERS,
+            "mode": "dropdown",
+            "options": ["gateway_sensor", "device", "disabled"],
+        }
+    }
+)
+
+SCAN_INTERVAL_VALIDATOR = vol.All(
+    vol.Coerce(int), vol.Range(min=30, max=3600)
+)
+
+# Fields of the user step following the host field. They are added with
+# extend(), which keeps the host field first.
+USER_STEP_FIELDS = {
+    vol.Optional(CONF_USERNAME, default="envoy"): str,
+    vol.Optional(CONF_PASSWORD, default=""): str,
+    vol.Optional(CONF_USE_LEGACY_NAME, default=False): bool,
+}
+USER_STEP_SCHEMA = vol.Schema({vol.Required(CONF_HOST): str}).extend(
+    USER_STEP_FIELDS
+)
+
+# The schema of the config step only depends on the gateway's encharges.
+CONFIG_STEP_SCHEMA = vol.Schema(
+    {vol.Required(CONF_INVERTERS): INVERTERS_SELECTOR}
+)
+CONFIG_STEP_ENCHARGE_SCHEMA = CONFIG_STEP_SCHEMA.extend(
+    {vol.Optional(CONF_ENCHARGE_ENTITIES, default=True): bool}
+)
+
+
+async def async_get_prepared_reader(
         hass: HomeAssistant,
         host: str,
-        username: str,
-        password: str,
 ) -> GatewayReader:
-    """Validate that the user input allows us to connect."""
+    """Return a gateway reader for host with the gateway info fetched.
+
+    No Enlighten client is passed in, the authentication class creates
+    its own on first use and closes it with the reader.
+
+    """
     gateway_reader = GatewayReader(
         host,
-        get_async_client(hass, verify_ssl=False)
+        get_async_client(hass, verify_ssl=False),
     )
     await gateway_reader.prepare()
+    return gateway_reader
+
+
+async def validate_input(
+        hass: HomeAssistant,
+        host: str,
+        username: str,
+        password: str,
+        gateway_reader: GatewayReader | None = None,
+) -> GatewayReader:
+    """Validate that the user input allows us to connect.
+
+    An already prepared gateway_reader for host can be passed in to skip
+    fetching the gateway info again.
+
+    """
+    if gateway_reader is None:
+        gateway_reader = await async_get_prepared_reader(hass, host)
     await gateway_reader.authenticate(username=username, password=password)
     await gateway_reader.update(limit_endpoints=ALLOWED_ENDPOINTS)
     return gateway_reader
@@ -60,11 +142,13 @@ class GatewayConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self):
         """Initialize an gateway flow."""
         self.ip_address = None
-        self.username = None
         self._reauth_entry = None
         self._discovery_info = None
         self._gateway_reader = None
         self._step_data = {}
+        self._current_hosts = None
+        self._user_step_schema = None
+        self._prepared_readers: dict[str, GatewayReader] = {}
 
     async def async_step_zeroconf(
             self,
@@ -86,17 +170,18 @@ class GatewayConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             Config flow result.
 
         """
-        _LOGGER.debug(f"""Zeroconf discovery: {discovery_info}""")
+        _LOGGER.debug("Zeroconf discovery: %s", discovery_info)
         self._discovery_info = discovery_info
         serial_num = discovery_info.properties["serialnum"]
         current_entry = await self.async_set_unique_id(serial_num)
 
         if current_entry and current_entry.pref_disable_new_entities:
             _LOGGER.debug(
-                f"""
-                Gateway autodiscovery/ip update disabled for: {serial_num},
-                IP detected: {discovery_info.host} {current_entry.unique_id}
-                """
+                "Gateway autodiscovery/ip update disabled for: %s, "
+                "IP detected: %s %s",
+                serial_num,
+                discovery_info.host,
+                current_entry.unique_id,
             )
             return self.async_abort(reason="pref_disable_new_entities")
 
@@ -104,20 +189,27 @@ class GatewayConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._abort_if_unique_id_configured({CONF_HOST: self.ip_address})
 
         # set unique_id if not set for an entry with the same IP adress
-        for entry in self._async_current_entries(include_ignore=False):
-            if not entry.unique_id and entry.data.get(CONF_HOST) == self.ip_adress:
-                #  update title with serial_num if title was not changed
-                if entry.title in {DEFAULT_TITLE, LEGACY_TITLE}:
-                    title = f"{entry.title} {serial_num}"
-                else:
-                    title = entry.title
-                self.hass.config_entries.async_update_entry(
-                    entry, title=title, unique_id=serial_num
-                )
-                self.hass.async_create_task(
-                    self.hass.config_entries.async_reload(entry.entry_id)
-                )
-                return self.async_abort(reason="already_configured")
+        # The entries are added in reverse, so the first entry of a host
+        # is kept if several entries share the host.
+        current_entries = self._async_current_entries(include_ignore=False)
+        entries_without_uid = {
+            entry.data.get(CONF_HOST): entry
+            for entry in reversed(current_entries)
+            if not entry.unique_id
+        }
+        if entry := entries_without_uid.get(self.ip_address):
+            #  update title with serial_num if title was not changed
+            if entry.title in DEFAULT_TITLES:
+                title = f"{entry.title} {serial_num}"
+            else:
+                title = entry.title
+            self.hass.config_entries.async_update_entry(
+                entry, title=title, unique_id=serial_num
+            )
+            self.hass.async_create_task(
+                self.hass.config_entries.async_reload(entry.entry_id)
+            )
+            return self.async_abort(reason="already_configured")
 
         return await self.async_step_user()
 
@@ -139,7 +231,6 @@ class GatewayConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         """
         errors: dict[str, str] = {}
-        description_placeholders: dict[str, str] = {}
 
         if self._reauth_entry:
             host = self._reauth_entry.data[CONF_HOST]
@@ -158,18 +249,15 @@ class GatewayConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     host,
                     username=user_input.get(CONF_USERNAME),
                     password=user_input.get(CONF_PASSWORD),
+                    gateway_reader=await self._async_get_prepared_reader(host),
                 )
-            except CONFIG_FLOW_USER_ERROR as err:
-                r = re.split('(?<=.)(?=[A-Z])', err.__class__.__name__)
-                errors["base"] = "_".join(r).lower()
-            except CannotConnect:
-                errors["base"] = "cannot_connect"
-            except Exception:
-                _LOGGER.exception("Unexpected exception")
-                errors["base"] = "unknown"
+            except Exception as err:
+                if (error_code := _get_error_code(err)) is None:
+                    _LOGGER.exception("Unexpected exception")
+                    error_code = "unknown"
+                errors["base"] = error_code
             else:
                 self._gateway_reader = gateway_reader
-                name = self._generate_name(use_legacy_name)
 
                 if self._reauth_entry:
                     self.hass.config_entries.async_update_entry(
@@ -187,14 +275,15 @@ class GatewayConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     await self.async_set_unique_id(
                         gateway_reader.serial_number
                     )
-                    name = self._generate_name(use_legacy_name)
-                    #  data[CONF_NAME] = self._generate_name(use_legacy_name)
-
                 else:
                     self._abort_if_unique_id_configured()
 
-                _data = {CONF_HOST: host, CONF_NAME: name} | user_input
-                self._step_data["user"] = _data
+                # The name contains the unique id, so it is generated once
+                # the unique id is set.
+                name = self._generate_name(use_legacy_name)
+                self._step_data["user"] = {
+                    CONF_HOST: host, CONF_NAME: name, **user_input
+                }
                 return await self.async_step_config()
 
         if self.unique_id:
@@ -206,7 +295,6 @@ class GatewayConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="user",
             data_schema=self._generate_shema_user_step(),
-            description_placeholders=description_placeholders,
             errors=errors,
         )
 
@@ -228,7 +316,6 @@ class GatewayConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         """
         errors: dict[str, str] = {}
-        description_placeholders: dict[str, str] = {}
         step_data = self._step_data["user"]
 
         if user_input is not None:
@@ -238,13 +325,13 @@ class GatewayConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 options=user_input,
             )
 
-        description_placeholders["gateway_type"] = self._gateway_reader.name
-
         return self.async_show_form(
             step_id="config",
             data_schema=self._generate_shema_config_step(),
             errors=errors,
-            description_placeholders=description_placeholders
+            description_placeholders={
+                "gateway_type": self._gateway_reader.name,
+            },
         )
 
     async def async_step_reauth(
@@ -278,52 +365,73 @@ class GatewayConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     @callback
     def _generate_shema_user_step(self):
-        """Generate schema."""
-        schema = {}
+        """Generate schema.
 
-        if self.ip_address:
-            schema[vol.Required(CONF_HOST, default=self.ip_address)] = vol.In(
-                [self.ip_address]
-            )
-        else:
-            schema[vol.Required(CONF_HOST)] = str
+        Only the host of a discovered gateway is dynamic. Its schema is
+        generated once per flow.
 
-        schema[
-            vol.Optional(CONF_USERNAME, default=self.username or "envoy")
-        ] = str
-        schema[vol.Optional(CONF_PASSWORD, default="")] = str
-        schema[vol.Optional(CONF_USE_LEGACY_NAME, default=False)] = bool
-        return vol.Schema(schema)
+        """
+        if not self.ip_address:
+            return USER_STEP_SCHEMA
+
+        if self._user_step_schema is None:
+            self._user_step_schema = vol.Schema({
+                vol.Required(CONF_HOST, default=self.ip_address): vol.In(
+                    [self.ip_address]
+                ),
+            }).extend(USER_STEP_FIELDS)
+        return self._user_step_schema
 
     @callback
     def _generate_shema_config_step(self):
         """Generate schema."""
-        schema = {
-            vol.Required(CONF_INVERTERS): selector(
-                {
-                    "select": {
-                        "translation_key": CONF_INVERTERS,
-                        "mode": "dropdown",
-                        "options": ["gateway_sensor", "device", "disabled"],
-                    }
-                }
-            ),
-        }
-
         if self._gateway_reader.gateway.encharge_inventory:
-            schema.update(
-                {vol.Optional(CONF_ENCHARGE_ENTITIES, default=True): bool}
+            return CONFIG_STEP_ENCHARGE_SCHEMA
+        return CONFIG_STEP_SCHEMA
+
+    @callback
+    def _get_current_hosts(self) -> frozenset[str]:
+        """Return a set of hosts.
+
+        The set is computed once per flow, so resubmitting the user form
+        doesn't scan the config entries again. It is frozen, as it is
+        shared by all calls.
+
+        """
+        if self._current_hosts is None:
+            self._current_hosts = frozenset(
+                entry.data[CONF_HOST]
+                for entry in self._async_current_entries(include_ignore=False)
+                if CONF_HOST in entry.data
             )
-        return vol.Schema(schema)
+        return self._current_hosts
+
+    async def _async_get_prepared_reader(self, host: str) -> GatewayReader:
+        """Return a prepared gateway reader for host.
+
+        The gateway info is fetched once per host and flow, so the form
+        can be resubmitted after an authentication error without fetching
+        it again. The readers of previously entered hosts are closed.
+
+        """
+        if (gateway_reader := self._prepared_readers.get(host)) is None:
+            await self._async_close_prepared_readers()
+            gateway_reader = await async_get_prepared_reader(self.hass, host)
+            self._prepared_readers[host] = gateway_reader
+        return gateway_reader
+
+    async def _async_close_prepared_readers(self) -> None:
+        """Close and forget the prepared gateway readers."""
+        prepared_readers = list(self._prepared_readers.values())
+        self._prepared_readers.clear()
+        for gateway_reader in prepared_readers:
+            await gateway_reader.aclose()
 
     @callback
-    def _get_current_hosts(self):
-        """Return a set of hosts."""
-        return {
-            entry.data[CONF_HOST]
-            for entry in self._async_current_entries(include_ignore=False)
-            if CONF_HOST in entry.data
-        }
+    def async_remove(self) -> None:
+        """Close the prepared gateway readers once the flow is removed."""
+        if self._prepared_readers:
+            self.hass.async_create_task(self._async_close_prepared_readers())
 
     def _generate_name(self, use_legacy_name=False):
         """Return the name of the entity."""
@@ -332,18 +440,6 @@ class GatewayConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             return f"{name} {self.unique_id}"
         return name
 
-    # async def _async_set_unique_id_from_gateway(
-    #         self,
-    #         gateway_reader: GatewayReader) -> bool:
-    #     """Set the unique id by fetching it from the gateway."""
-    #     serial_num = None
-    #     with contextlib.suppress(httpx.HTTPError):
-    #         serial_num = await gateway_reader.get_serial_number()
-    #     if serial_num:
-    #         await self.async_set_unique_id(serial_num)
-    #         return True
-    #     return False
-
     @staticmethod
     @callback
     def async_get_options_flow(
@@ -359,6 +455,7 @@ class GatewayOptionsFlow(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         """Initialize options flow."""
         self.config_entry = config_entry
+        self._data_schema = None
 
     async def async_step_init(
             self,
@@ -374,33 +471,38 @@ class GatewayOptionsFlow(config_entries.OptionsFlow):
 
     @callback
     def _generate_data_shema(self):
-        """Generate schema."""
+        """Generate schema.
+
+        The schema is generated once per options flow.
+
+        """
+        if self._data_schema is not None:
+            return self._data_schema
+
         options = self.config_entry.options
-        options_keys = options.keys()
         options_inverters = options.get(CONF_INVERTERS, "disabled")
         schema = {
-            vol.Optional(CONF_INVERTERS, default=options_inverters): selector(
-                {
-                    "select": {
-                        "translation_key": CONF_INVERTERS,
-                        "mode": "dropdown",
-                        "options": ["gateway_sensor", "device", "disabled"],
-                    }
-                }
-            ),
+            vol.Optional(
+                CONF_INVERTERS, default=options_inverters
+            ): INVERTERS_SELECTOR,
+            vol.Optional(
+                CONF_SCAN_INTERVAL,
+                default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+            ): SCAN_INTERVAL_VALIDATOR,
         }
-        if CONF_ENCHARGE_ENTITIES in options_keys:
+        if CONF_ENCHARGE_ENTITIES in options:
             schema.update({
                 vol.Optional(
                     CONF_ENCHARGE_ENTITIES,
                     default=options.get(CONF_ENCHARGE_ENTITIES)
                 ): bool,
             })
-        if CONF_CACHE_TOKEN in options_keys:
+        if CONF_CACHE_TOKEN in options:
             schema.update({
                 vol.Optional(
                     CONF_CACHE_TOKEN,
                     default=options.get(CONF_CACHE_TOKEN)
                 ): bool,
             })
-        return vol.Schema(schema)
+        self._data_schema = vol.Schema(schema)
+        return self._data_schema
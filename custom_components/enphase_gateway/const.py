@@ -27,20 +27,12 @@ CONFIG_FLOW_USER_ERROR = (
     GatewayCommunicationError,
 )
 
-AVAILABLE_PROPERTIES = {
-    "production", "daily_production", "seven_days_production",
-    "lifetime_production", "consumption", "daily_consumption",
-    "seven_days_consumption", "lifetime_consumption", "inverters_production",
-    "grid_status", "ensemble_power", "ensemble_submod", "ensemble_secctrl",
-    "battery_storage", "encharge_inventory", "encharge_power"
-}
-
-ALLOWED_ENDPOINTS = [
+ALLOWED_ENDPOINTS = frozenset({
     "info", "info.xml", "production", "api/v1/production", "production.json",
     "api/v1/production/inverters", "ivp/ensemble/inventory", "home.json",
     "ivp/ensemble/power", "ivp/ensemble/secctrl", "ivp/meters/readings",
-    "auth/check_jwt" "ivp/meters",
-]
+    "auth/check_jwt", "ivp/meters",
+})
 
 CONF_SERIAL_NUM = "serial_num"
 CONF_USE_TOKEN_AUTH = "use_token_auth"
@@ -52,3 +44,6 @@ CONF_GET_INVERTERS = "get_inverters"
 CONF_ENCHARGE_ENTITIES = "encharge_entities"
 CONF_USE_LEGACY_NAME = "use_lagacy_name"
 CONF_INVERTERS = "inverters_config"
+
+# Default polling interval of the gateway (seconds).
+DEFAULT_SCAN_INTERVAL = 60
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Any, TYPE_CHECKING
@@ -16,20 +17,21 @@ import homeassistant.util.dt as dt_util
 from homeassistant.const import (
     CONF_NAME,
     CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
     CONF_USERNAME,
-    CONF_TOKEN,
 )
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 
-from .const import ALLOWED_ENDPOINTS
+from .const import ALLOWED_ENDPOINTS, DEFAULT_SCAN_INTERVAL
 from .gateway_reader.auth import EnphaseTokenAuth
 from .gateway_reader.exceptions import (
     EnlightenAuthenticationError,
     GatewayAuthenticationRequired,
     GatewayAuthenticationError,
+    GatewayResponseError,
 )
 
 
@@ -37,8 +39,6 @@ if TYPE_CHECKING:
     from .gateway_reader import GatewayReader
 
 
-SCAN_INTERVAL = timedelta(seconds=60)
-
 STORAGE_KEY = "enphase_gateway"
 STORAGE_VERSION = 1
 
@@ -75,18 +75,27 @@ class GatewayReaderUpdateCoordinator(DataUpdateCoordinator):
             hass,
             _LOGGER,
             name=entry.data[CONF_NAME],
-            update_interval=SCAN_INTERVAL,
+            update_interval=timedelta(
+                seconds=entry.options.get(
+                    CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+                )
+            ),
             # always_update=False, # TODO: Added in ha 2023.9
         )
 
     async def _async_setup_and_authenticate(self) -> None:
         """Set up the gateway reader and authenticate."""
         gateway_reader = self.gateway_reader
-        await gateway_reader.prepare()
+        # Fetching the gateway info and loading the token from the store
+        # are independent, so both are done concurrently.
+        _, token = await asyncio.gather(
+            gateway_reader.prepare(),
+            self._async_load_cached_token(),
+        )
         if not gateway_reader.serial_number:
             return  # TODO add logic
 
-        if token := await self._async_load_cached_token():
+        if token:
             await gateway_reader.authenticate(
                 username=self.username,
                 password=self.password,
@@ -113,7 +122,7 @@ class GatewayReaderUpdateCoordinator(DataUpdateCoordinator):
         if self.gateway_reader.auth.is_stale:
             self.hass.async_create_background_task(
                 self._async_try_refresh_token(),
-                "{self.name} token refresh"
+                f"{self.name} token refresh",
             )
 
     async def _async_try_refresh_token(self) -> None:
@@ -124,10 +133,10 @@ class GatewayReaderUpdateCoordinator(DataUpdateCoordinator):
         try:
             await self.gateway_reader.auth.refresh_token()
         except:  # EnvoyError as err: # TODO: Error handling
-            _LOGGER.debug(f"{self.name}: Error refreshing token")
+            _LOGGER.debug("%s: Error refreshing token", self.name)
             return
         else:
-            self._async_update_cached_token()
+            await self._async_update_cached_token()
 
     @callback
     def _async_mark_setup_complete(self) -> None:
@@ -153,7 +162,9 @@ class GatewayReaderUpdateCoordinator(DataUpdateCoordinator):
         """Update saved token in config entry."""
         if not isinstance(self.gateway_reader.auth, EnphaseTokenAuth):
             return
-        _LOGGER.debug(f"{self.name}: Updating token in config entry from auth")
+        _LOGGER.debug(
+            "%s: Updating token in config entry from auth", self.name
+        )
         if token := self.gateway_reader.auth.token:
             self._store_data["token"] = token
             self._store_update_pending = True
@@ -168,22 +179,6 @@ class GatewayReaderUpdateCoordinator(DataUpdateCoordinator):
             await self._store.async_save(self._store_data)
             self._store_update_pending = False
 
-    def _async_update_saved_token(self) -> None:
-        """Update saved token in config entry."""
-        if not isinstance(self.gateway_reader.auth, EnphaseTokenAuth):
-            return
-        # update token in config entry so we can
-        # startup without hitting the Cloud API
-        # as long as the token is valid
-        _LOGGER.debug(f"{self.name}: Updating token in config entry from auth")
-        self.hass.config_entries.async_update_entry(
-            self.entry,
-            data={
-                **self.entry.data,
-                CONF_TOKEN: self.gateway_reader.auth.token,
-            },
-        )
-
     async def _async_update_data(self) -> dict[str, Any]:
 
         gateway_reader = self.gateway_reader
@@ -204,9 +199,13 @@ class GatewayReaderUpdateCoordinator(DataUpdateCoordinator):
                 ) from err
                 # continue
 
-            except (EnlightenAuthenticationError, GatewayAuthenticationRequired) as err:
+            except EnlightenAuthenticationError as err:
+                # Enlighten credentials are invalid - setting up again with
+                # the same credentials can't succeed.
+                raise ConfigEntryAuthFailed from err
+
+            except GatewayAuthenticationRequired as err:
                 # token likely expired or firmware changed - re-authenticate
-                # Enlighten credentials are likely to be invalid
                 if self._setup_complete and _try == 0:
                     self._setup_complete = False
                     continue
@@ -217,4 +216,7 @@ class GatewayReaderUpdateCoordinator(DataUpdateCoordinator):
                     f"Error communicating with API: {err}"
                 ) from err
 
+            except GatewayResponseError as err:
+                raise UpdateFailed(f"Invalid gateway response: {err}") from err
+
         raise RuntimeError("Unreachable code in _async_update_data")
@@ -1,17 +1,22 @@
 """Enphase Gateway authentication module."""
 
-import json
+import time
+import base64
+import asyncio
+import binascii
 import logging
 from pathlib import Path
+from types import MappingProxyType
+from functools import lru_cache
+from collections.abc import Mapping
 from datetime import datetime, timezone, timedelta
 from abc import abstractmethod, abstractproperty
 
-import jwt
 import httpx
 import orjson
-from bs4 import BeautifulSoup
+from lxml import etree
 
-from .http import async_get, async_post
+from .http import async_get, async_post, HTTP2_AVAILABLE, get_ssl_context
 from .exceptions import (
     EnlightenAuthenticationError,
     EnlightenCommunicationError,
@@ -28,6 +33,46 @@ _LOGGER = logging.getLogger(__name__)
 BASE_DIR = Path(__file__).resolve().parent
 
 
+@lru_cache(maxsize=16)
+def decode_jwt_payload(token: str) -> Mapping:
+    """Return the payload of the given JWT token.
+
+    The signature is not verified, so the payload segment is decoded
+    directly. Results are cached per token, so the token is only decoded
+    once no matter how often its claims are read. The cached claims are
+    shared by all callers and therefore returned read-only.
+
+    Raises
+    ------
+    InvalidTokenError
+        If the token is not a valid JWT token.
+
+    """
+    try:
+        payload_segment = token.split(".")[1]
+        payload = base64.urlsafe_b64decode(payload_segment + "==")
+        claims = orjson.loads(payload)
+    except (AttributeError, IndexError, binascii.Error, ValueError) as err:
+        raise InvalidTokenError("Malformed JWT token") from err
+
+    if not isinstance(claims, dict):
+        raise InvalidTokenError("Malformed JWT token")
+
+    return MappingProxyType(claims)
+
+
+@lru_cache(maxsize=4)
+def bearer_headers(token: str | None) -> Mapping[str, str]:
+    """Return the authorization headers for the given token.
+
+    The headers are sent with every gateway request but only change when
+    the token does, so they are cached per token. The cached headers are
+    shared by all callers and therefore returned read-only.
+
+    """
+    return MappingProxyType({"Authorization": f"Bearer {token}"})
+
+
 class GatewayAuth:
     """Base class for gateway authentication."""
 
@@ -39,6 +84,11 @@ class GatewayAuth:
     async def update(self, client: httpx.AsyncClient) -> None:
         """Update the authentication class for authentication."""
 
+    @property
+    def update_required(self) -> bool:
+        """Return True if update() has anything to do."""
+        return False
+
     @abstractproperty
     def protocol(self) -> str:
         """Return the http protocol."""
@@ -48,7 +98,7 @@ class GatewayAuth:
         """Return the httpx auth object."""
 
     @abstractproperty
-    def headers(self) -> dict[str, str]:
+    def headers(self) -> Mapping[str, str]:
         """Return the auth headers."""
 
     @abstractproperty
@@ -59,6 +109,18 @@ class GatewayAuth:
     def get_endpoint_url(self, endpoint: str) -> str:
         """Return the URL for the endpoint."""
 
+    async def aclose(self) -> None:
+        """Release the resources held by the authentication class."""
+        pass
+
+    async def __aenter__(self):
+        """Enter the async context manager."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        """Exit the async context manager and release the resources."""
+        await self.aclose()
+
 
 class LegacyAuth(GatewayAuth):
     """Class for legacy authentication using username and password."""
@@ -67,6 +129,11 @@ class LegacyAuth(GatewayAuth):
         self._host = host
         self._username = username
         self._password = password
+        # Keep a single DigestAuth instance. It remembers the last challenge
+        # and signs the following requests without another 401 round trip.
+        self._auth = None
+        if username and password:
+            self._auth = httpx.DigestAuth(username, password)
 
     @property
     def protocol(self) -> str:
@@ -74,14 +141,12 @@ class LegacyAuth(GatewayAuth):
         return "http"
 
     @property
-    def auth(self) -> httpx.DigestAuth:
+    def auth(self) -> httpx.DigestAuth | None:
         """Return httpx authentication."""
-        if not self._username or not self._password:
-            return None
-        return httpx.DigestAuth(self._username, self._password)
+        return self._auth
 
     @property
-    def headers(self) -> dict[str, str]:
+    def headers(self) -> Mapping[str, str]:
         """Return the headers for legacy authentication."""
         return {}
 
@@ -128,6 +193,9 @@ class EnphaseTokenAuth(GatewayAuth):
         are not provided.
     stale_token_threshold : datetime.timedelta, default=timedelta(days=30)
         Timedelta describing the stale token treshold.
+    enlighten_client : httpx.AsyncClient, optional
+        httpx async client used for Enlighten. A client will be created if
+        no client is provided. Only self-created clients are closed.
 
     Raises
     ------
@@ -157,7 +225,8 @@ class EnphaseTokenAuth(GatewayAuth):
             cache_token: bool = False,
             cache_filepath: str | None = "token.json",
             auto_renewal: bool = True,
-            stale_token_threshold: timedelta = timedelta(days=30)
+            stale_token_threshold: timedelta = timedelta(days=30),
+            enlighten_client: httpx.AsyncClient | None = None,
     ) -> None:
         """Initialize EnphaseTokenAuth."""
         self._host = host
@@ -167,9 +236,12 @@ class EnphaseTokenAuth(GatewayAuth):
         self._token = token_raw
         self._cache_token = cache_token
         self._cache_filepath = cache_filepath
-        self._stale_token_threshold = stale_token_threshold
+        self._stale_token_threshold = stale_token_threshold.total_seconds()
         self._enlighten_credentials = False
         self._cookies = None
+        self._owns_enlighten_client = enlighten_client is None
+        self._enlighten_client = enlighten_client
+        self._lock = asyncio.Lock()
 
         if self._cache_filepath:
             self._cache_filepath = Path(self._cache_filepath).resolve()
@@ -203,42 +275,88 @@ class EnphaseTokenAuth(GatewayAuth):
         return self._token
 
     @property
-    def headers(self) -> None:
+    def headers(self) -> Mapping[str, str]:
         """Return the headers for token authentication."""
-        return {"Authorization": f"Bearer {self.token}"}
+        return bearer_headers(self.token)
 
     @property
     def cookies(self) -> dict[str, str]:
         """Return the cookies for token authentication."""
         return self._cookies
 
+    @property
+    def enlighten_client(self) -> httpx.AsyncClient:
+        """Return the httpx client used to communicate with Enlighten.
+
+        The client is created on first use and reused for all following
+        requests to keep the connections to Enlighten alive. HTTP/2 is
+        used if it is supported by the installed httpx.
+
+        """
+        if not self._owns_enlighten_client:
+            return self._enlighten_client
+        if self._enlighten_client is None or self._enlighten_client.is_closed:
+            self._enlighten_client = httpx.AsyncClient(
+                verify=get_ssl_context(),
+                timeout=10.0,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_keepalive_connections=4,
+                    keepalive_expiry=300,
+                ),
+            )
+        return self._enlighten_client
+
+    @property
+    def expiration_timestamp(self) -> int:
+        """Return the expiration of the Enphase token as epoch timestamp."""
+        return self._decode_token(self._token)["exp"]
+
     @property
     def expiration_date(self) -> datetime:
         """Return the expiration date of the Enphase token."""
-        payload = self._decode_token(self._token)
-        return datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+        return datetime.fromtimestamp(
+            self.expiration_timestamp,
+            tz=timezone.utc,
+        )
 
     @property
     def is_expired(self) -> bool:
         """Return the expiration status of the Enphase token."""
-        if datetime.now(tz=timezone.utc) <= self.expiration_date:
-            return False
-        return True
+        return time.time() > self.expiration_timestamp
 
     @property
     def is_stale(self) -> bool:
         """Return whether the token is about to expire."""
-        exp_time = self.expiration_date - self._stale_token_threshold
-        if datetime.now(tz=timezone.utc) <= exp_time:
-            return False
-        return True
+        exp_time = self.expiration_timestamp - self._stale_token_threshold
+        return time.time() > exp_time
 
     def get_endpoint_url(self, endpoint: str) -> str:
         """Return the URL for the endpoint."""
         return f"https://{self._host}{endpoint}"
 
+    @property
+    def update_required(self) -> bool:
+        """Return whether the token or the cookies need an update."""
+        return not (self._token and self._cookies and not self.is_stale)
+
     async def update(self, async_client: httpx.AsyncClient) -> None:
-        """Update authentication method."""
+        """Update authentication method.
+
+        Concurrent calls are serialized, so parallel requests trigger at
+        most one token setup or refresh.
+
+        """
+        if not self.update_required:
+            return  # steady state - nothing to update
+
+        async with self._lock:
+            # another caller might have updated while we were waiting
+            if self.update_required:
+                await self._update(async_client)
+
+    async def _update(self, async_client: httpx.AsyncClient) -> None:
+        """Set up or refresh the token and the cookies."""
         if not self._token:
             _LOGGER.debug(
                 "Token not found - setting up token for authentication"
@@ -249,12 +367,12 @@ class EnphaseTokenAuth(GatewayAuth):
             if self._auto_renewal:
                 try:
                     _LOGGER.debug("Stale token - trying to refresh token")
-                    await self.refresh_token()
+                    await self._refresh_token()
                 except httpx.TransportError as err:
                     if self.is_expired:
                         raise err
                     else:
-                        _LOGGER.debug("Error refreshing stale token: {err}")
+                        _LOGGER.debug("Error refreshing stale token: %s", err)
                         pass
 
             else:
@@ -271,13 +389,23 @@ class EnphaseTokenAuth(GatewayAuth):
 
     async def refresh_token(self) -> None:
         """Refresh the Enphase token."""
+        token = self._token
+        async with self._lock:
+            if self._token != token:
+                return  # refreshed by another caller while waiting
+
+            await self._refresh_token()
+
+    async def _refresh_token(self) -> None:
+        """Fetch a new Enphase token from Enlighten."""
         if not self._enlighten_credentials:
             raise TokenAuthConfigError(
                 "Enlighten credentials required for token refreshing"
             )
         self._token = await self._fetch_enphase_token()
         self._cookies = None
-        _LOGGER.debug(f"New token valid until: {self.expiration_date}")
+        await self._token_refreshed()
+        _LOGGER.debug("New token valid until: %s", self.expiration_date)
 
     async def refresh_cookies(self, async_client: httpx.AsyncClient) -> None:
         """Try to refresh the cookies."""
@@ -286,18 +414,25 @@ class EnphaseTokenAuth(GatewayAuth):
             self._cookies = cookies
 
     async def resolve_401(self, async_client) -> bool:
-        """Resolve 401 Unauthorized response."""
+        """Resolve 401 Unauthorized response.
+
+        The token is only discarded if no concurrent caller has replaced
+        it while it was being checked.
+
+        """
+        token = self._token
         try:
-            self.refresh_cookies(async_client)
-        except httpx.TransportError as err:
-            raise GatewayCommunicationError(
-                "Error trying to refresh token cookies: {err}",
-                request=err.request,
-            ) from err
+            cookies = await self._check_jwt(async_client, token)
         except InvalidTokenError:
-            self._token = None
-            self._cookies = None
-            self.update(async_client)
+            async with self._lock:
+                if self._token == token:
+                    self._token = None
+                    self._cookies = None
+            await self.update(async_client)
+            return
+
+        if cookies is not None and self._token == token:
+            self._cookies = cookies
 
     async def _setup_token(self, async_client: httpx.AsyncClient) -> None:
         """Set up the initial Enphase token."""
@@ -323,22 +458,19 @@ class EnphaseTokenAuth(GatewayAuth):
                 ) from err
             else:
                 self._token = token
+                await self._token_refreshed()
 
         if not self._token:
             raise GatewayAuthenticationError(
                 "Could not obtain a token for token authentication"
             )
 
-    def _decode_token(self, token: str) -> dict:
+    def _decode_token(self, token: str) -> Mapping:
         """Decode the given JWT token."""
         try:
-            jwt_payload = jwt.decode(
-                token,
-                algorithms=["ES256"],
-                options={"verify_signature": False},
-            )
-        except jwt.exceptions.InvalidTokenError as err:
-            _LOGGER.debug(f"Error decoding JWT token: {token[:6]}, {err}")
+            jwt_payload = decode_jwt_payload(token)
+        except InvalidTokenError as err:
+            _LOGGER.debug("Error decoding JWT token: %.6s, %s", token, err)
             raise err
         else:
             return jwt_payload
@@ -346,33 +478,38 @@ class EnphaseTokenAuth(GatewayAuth):
     async def _fetch_enphase_token(self) -> str:
         """Fetch the Enphase token from Enlighten."""
         _LOGGER.debug("Fetching new token from Enlighten.")
-        _async_client = httpx.AsyncClient(verify=True, timeout=10.0)
-
-        async with _async_client as async_client:
-            # retrieve session id from enlighten
-            resp = await self._async_post_enlighten(
-                async_client,
-                self.LOGIN_URL,
-                data={
-                    'user[email]': self._enlighten_username,
-                    'user[password]': self._enlighten_password
-                }
-            )
-            response_data = orjson.loads(resp.text)
-            self._is_consumer = response_data["is_consumer"]
-            self._manager_token = response_data["manager_token"]
+        async_client = self.enlighten_client
+
+        # retrieve session id from enlighten
+        resp = await self._async_post_enlighten(
+            async_client,
+            self.LOGIN_URL,
+            data={
+                'user[email]': self._enlighten_username,
+                'user[password]': self._enlighten_password
+            }
+        )
+        response_data = orjson.loads(resp.content)
+        self._is_consumer = response_data["is_consumer"]
+        self._manager_token = response_data["manager_token"]
+
+        # retrieve token from enlighten
+        resp = await self._async_post_enlighten(
+            async_client,
+            self.TOKEN_URL,
+            json={
+                'session_id': response_data['session_id'],
+                'serial_num': self._gateway_serial_num,
+                'username': self._enlighten_username
+            }
+        )
+        return resp.text
 
-            # retrieve token from enlighten
-            resp = await self._async_post_enlighten(
-                async_client,
-                self.TOKEN_URL,
-                json={
-                    'session_id': response_data['session_id'],
-                    'serial_num': self._gateway_serial_num,
-                    'username': self._enlighten_username
-                }
-            )
-            return resp.text
+    async def aclose(self) -> None:
+        """Close the Enlighten client."""
+        if self._owns_enlighten_client and self._enlighten_client is not None:
+            await self._enlighten_client.aclose()
+            self._enlighten_client = None
 
     async def _async_post_enlighten(
         self,
@@ -418,7 +555,7 @@ class EnphaseTokenAuth(GatewayAuth):
         if token is None:
             if fail_silent:
                 return None
-            raise InvalidTokenError(f"Invalid token: '{token[:9]}...'")
+            raise InvalidTokenError("Invalid token: 'None'")
 
         try:
             resp = await async_get(
@@ -429,31 +566,32 @@ class EnphaseTokenAuth(GatewayAuth):
             )
 
         except httpx.HTTPStatusError as err:
-            if resp.status_code == 401:
-                _LOGGER.debug(f"Error while checking token: {err}")
-                if fail_silent:
-                    return None
-                raise InvalidTokenError(
-                    f"Invalid token: '{token[:9]}...'"
-                ) from err
+            if err.response.status_code != 401:
+                raise err
+            _LOGGER.debug("Error while checking token: %s", err)
+            if fail_silent:
+                return None
+            raise InvalidTokenError(
+                f"Invalid token: '{token[:9]}...'"
+            ) from err
 
         except httpx.TransportError as err:
-            _LOGGER.debug(f"Transport Error while checking token: {err}")
+            _LOGGER.debug("Transport Error while checking token: %s", err)
             if fail_silent:
                 return None
             raise GatewayCommunicationError(
-                "Error trying to validate token: {err}",
+                f"Error trying to validate token: {err}",
                 request=err.request,
             ) from err
 
         else:
-            soup = BeautifulSoup(resp.text, features="html.parser")
-            validity = soup.find("h2").contents[0]
+            html = etree.HTML(resp.content)
+            validity = html.findtext(".//h2") if html is not None else None
             if validity == "Valid token.":
-                _LOGGER.debug(f"Valid token: '{token[:9]}...'")
+                _LOGGER.debug("Valid token: '%.9s...'", token)
                 return resp.cookies
             else:
-                _LOGGER.debug(f"Invalid token: '{token[:9]}...'")
+                _LOGGER.debug("Invalid token: '%.9s...'", token)
                 if fail_silent:
                     return None
                 raise InvalidTokenError(f"Invalid token: '{token[:9]}...'")
@@ -461,23 +599,41 @@ class EnphaseTokenAuth(GatewayAuth):
     async def _token_refreshed(self):
         """Signal for refreshed token."""
         if self._cache_token:
-            self._save_token_to_cache(self.token)
+            await self._save_token_to_cache(self.token)
 
     async def _load_token_from_cache(self) -> str | None:
         """Return the cached token."""
-        if filepath := self._cache_filepath.is_file():
-            with filepath.open() as f:
-                token_json = json.load(f)
-            return token_json.get("EnphaseToken")
-
-        _LOGGER.debug(
-            f"Error loading token from cache: {self._cache_filepath}"
-        )
-        return None
+        if not self._cache_filepath:
+            return None
+        return await asyncio.to_thread(self._read_token_cache)
 
     async def _save_token_to_cache(self, token_raw: str) -> None:
         """Add the token to the cache."""
-        token_json = {"EnphaseToken": token_raw}
+        if not self._cache_filepath:
+            return
+        await asyncio.to_thread(self._write_token_cache, token_raw)
+
+    def _read_token_cache(self) -> str | None:
+        """Read the token from the cache file."""
+        filepath = self._cache_filepath
+        try:
+            token_json = orjson.loads(filepath.read_bytes())
+        except (OSError, ValueError) as err:
+            _LOGGER.debug(
+                "Error loading token from cache: %s: %s", filepath, err
+            )
+            return None
+
+        return token_json.get("EnphaseToken")
+
+    def _write_token_cache(self, token_raw: str) -> None:
+        """Write the token to the cache file.
+
+        The token is written to a temporary file first, which then replaces
+        the cache file. This way the cache file is never left half written.
+
+        """
         filepath = self._cache_filepath
-        with filepath.open("w+") as f:
-            json.dump(token_json, f)
+        tmp_filepath = filepath.with_name(filepath.name + ".tmp")
+        tmp_filepath.write_bytes(orjson.dumps({"EnphaseToken": token_raw}))
+        tmp_filepath.replace(filepath)
@@ -5,11 +5,14 @@ from awesomeversion import AwesomeVersion
 
 LEGACY_ENVOY_VERSION = AwesomeVersion("3.9.0")
 
+# Responses larger than this are rejected instead of parsed (bytes).
+MAX_RESPONSE_SIZE = 1000000
+
 AVAILABLE_PROPERTIES = {
     "production", "daily_production", "seven_days_production",
     "lifetime_production", "consumption", "daily_consumption",
     "seven_days_consumption", "lifetime_consumption", "inverters_production",
-    "grid_status", "ensemble_power", "ensemble_submod", "ensemble_secctrl",
-    "battery_storage", "grid_import", "grid_import_lifetime", "grid_export",
-    "grid_export_lifetime",
+    "grid_status", "ensemble_power", "ensemble_power_totals",
+    "ensemble_submod", "ensemble_secctrl", "battery_storage", "grid_import",
+    "grid_import_lifetime", "grid_export", "grid_export_lifetime",
 }
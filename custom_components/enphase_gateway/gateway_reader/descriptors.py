@@ -11,6 +11,16 @@ from .endpoint import GatewayEndpoint
 
 _LOGGER = logging.getLogger(__name__)
 
+# Multipliers converting the units shown by legacy gateways to W and Wh.
+UNIT_SCALE = {
+    "W": 1,
+    "kW": 1000,
+    "MW": 1000000,
+    "Wh": 1,
+    "kWh": 1000,
+    "MWh": 1000000,
+}
+
 
 class BaseDescriptor:
     """Base descriptor."""
@@ -31,12 +41,29 @@ class BaseDescriptor:
             else:
                 setattr(owner, uid, {name: _endpoint})
 
+    def _resolve_cached(self, obj, data, resolve):
+        """Return the result of resolve(data) cached per response data.
+
+        The endpoint data is replaced on every fetch, so a cached result
+        stays valid as long as it was computed from the very same object.
+
+        """
+        cache = obj._descriptor_cache
+        if (cached := cache.get(self._name)) and cached[0] is data:
+            return cached[1]
+
+        result = resolve(data)
+        cache[self._name] = (data, result)
+        return result
+
 
 class PropertyDescriptor(BaseDescriptor):
     """Property descriptor.
 
     A pure python implementation of property that registers the
     required endpoint and the caching interval.
+    If memoize is True the result is only recomputed when the data of the
+    required endpoint changes.
     """
 
     def __init__(
@@ -45,10 +72,12 @@ class PropertyDescriptor(BaseDescriptor):
             doc=None,
             required_endpoint: str | None = None,
             cache: int = 0,
+            memoize: bool = False,
     ) -> None:
         """Initialize instance of PropertyDescriptor."""
         super().__init__(required_endpoint, cache)
         self.fget = fget
+        self._memoize = memoize
         if doc is None and fget is not None:
             doc = fget.__doc__
         self.__doc__ = doc
@@ -60,6 +89,13 @@ class PropertyDescriptor(BaseDescriptor):
             return self
         if self.fget is None:
             raise AttributeError(f"property '{self._name}' has no getter")
+        if self._memoize:
+            return self._resolve_cached(
+                obj,
+                obj.data.get(self._required_endpoint),
+                lambda data: self.fget(obj),
+            )
+
         return self.fget(obj)
 
 
@@ -86,61 +122,67 @@ class JsonDescriptor(BaseDescriptor):
 
     def __get__(self, obj, objtype=None):
         """Magic method. Resolve the jasonpath expression."""
+        if obj is None:
+            return self
         if self._required_endpoint:
-            data = obj.data.get(self._required_endpoint, {})
-        else:
-            data = obj.data or {}
-        return self.resolve(self.jsonpath_expr, data)
+            return self._resolve_cached(
+                obj,
+                obj.data.get(self._required_endpoint, {}),
+                lambda data: self.resolve(self.jsonpath_expr, data),
+            )
+
+        return self.resolve(self.jsonpath_expr, obj.data or {})
 
     @classmethod
     def resolve(cls, path: str, data: dict, default: str | int | float = None):
         """Classmethod to resolve a given JsonPath."""
-        _LOGGER.debug(f"Resolving jsonpath: {path} using data: {data}")
         if path == "":
             return data
         result = jsonpath(data, dedent(path))
         if result is False:
             _LOGGER.debug(
-                f"The configured jsonpath: {path}, did not return anything!"
+                "The configured jsonpath: %s, did not return anything!", path
             )
             return default
 
         if isinstance(result, list) and len(result) == 1:
             result = result[0]
 
-        _LOGGER.debug(f"The configured jsonpath: {path}, did return {result}")
+        _LOGGER.debug(
+            "The configured jsonpath: %s, did return %s", path, result
+        )
         return result
 
 
 class RegexDescriptor(BaseDescriptor):
-    """Regex gateway property descriptor."""
+    """Regex gateway property descriptor.
+
+    The regex is compiled once when the descriptor is created.
+    """
 
     def __init__(self, required_endpoint, regex, cache: int = 0):
         super().__init__(required_endpoint, cache)
-        self._regex = regex
+        self._regex = re.compile(regex)
 
     def __get__(self, obj, objtype=None):
         """Magic method. Resolve the regex expression."""
-        data = obj.data.get(self._required_endpoint, "")
-        return self.resolve(self._regex, data)
+        if obj is None:
+            return self
+        return self._resolve_cached(
+            obj,
+            obj.data.get(self._required_endpoint, ""),
+            lambda data: self.resolve(self._regex, data),
+        )
 
     @classmethod
-    def resolve(cls, regex: str, data: str):
+    def resolve(cls, regex: re.Pattern | str, data: str):
         """Classmethod to resolve a given REGEX."""
-        text = data
-        match = re.search(regex, text, re.MULTILINE)
-        if match:
-            if match.group(2) in {"kW", "kWh"}:
-                result = float(match.group(1)) * 1000
-            elif match.group(2) in {"mW", "MWh"}:
-                result = float(match.group(1)) * 1000000
-            else:
-                result = float(match.group(1))
-        else:
-            _LOGGER.debug(
-                f"The configured REGEX: {regex}, did not return anything!"
-            )
-            return None
-
-        f"The configured REGEX: {regex}, did return {result}"
-        return result
+        if isinstance(regex, str):
+            regex = re.compile(regex)
+        if match := regex.search(data):
+            return float(match.group(1)) * UNIT_SCALE[match.group(2)]
+
+        _LOGGER.debug(
+            "The configured REGEX: %s, did not return anything!", regex
+        )
+        return None
@@ -6,6 +6,8 @@ import time
 class GatewayEndpoint:
     """Class representing a Gateway endpoint."""
 
+    __slots__ = ("path", "cache", "fetch", "_last_fetch", "_base_url", "_urls")
+
     def __init__(
             self,
             endpoint_path: str,
@@ -18,6 +20,7 @@ class GatewayEndpoint:
         self.fetch = fetch
         self._last_fetch = None
         self._base_url = "{}://{}/{}"
+        self._urls = {}
 
     def __repr__(self):
         """Magic method. Use path for representation."""
@@ -36,8 +39,16 @@ class GatewayEndpoint:
         return False
 
     def get_url(self, protocol, host):
-        """Return formatted url."""
-        return self._base_url.format(protocol, host, self.path)
+        """Return formatted url.
+
+        Endpoints are shared by all gateways of the same class, so the
+        formatted urls are cached per protocol and host.
+
+        """
+        if (url := self._urls.get((protocol, host))) is None:
+            url = self._base_url.format(protocol, host, self.path)
+            self._urls[(protocol, host)] = url
+        return url
 
     def success(self, timestamp: float = None):
         """Update the last_fetch timestamp."""
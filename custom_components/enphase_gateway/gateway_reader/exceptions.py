@@ -51,6 +51,13 @@ class GatewayCommunicationError(CommunicationError):
     """Exception raised for communication errors with the gateway."""
 
 
+class GatewayResponseError(GatewayError):
+    """Exception raised for a gateway response that can't be used.
+
+    Raised if a response exceeds the size limit.
+    """
+
+
 # EnphaseTokenAuth errors --->
 
 class TokenAuthConfigError(GatewayError):
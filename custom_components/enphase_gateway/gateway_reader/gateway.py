@@ -5,14 +5,15 @@ from __future__ import annotations
 import logging
 from typing import Callable
 
+import orjson
 import xmltodict
 from httpx import Response
 
-from .const import AVAILABLE_PROPERTIES
+from .const import AVAILABLE_PROPERTIES, MAX_RESPONSE_SIZE
 from .endpoint import GatewayEndpoint
+from .exceptions import GatewayResponseError
 from .descriptors import (
     PropertyDescriptor,
-    ResponseDescriptor,
     JsonDescriptor,
     RegexDescriptor,
 )
@@ -21,6 +22,31 @@ from .descriptors import (
 _LOGGER = logging.getLogger(__name__)
 
 
+def _parse_json(response: Response):
+    """Parse a JSON response."""
+    return orjson.loads(response.content)
+
+
+def _parse_xml(response: Response):
+    """Parse a XML response."""
+    # Let the parser handle the encoding declared in the document.
+    return xmltodict.parse(response.content)
+
+
+def _parse_text(response: Response):
+    """Return the response text."""
+    return response.text
+
+
+# Response parsers by content type. Unknown types are stored as text.
+CONTENT_PARSERS = {
+    "application/json": _parse_json,
+    "text/xml": _parse_xml,
+    "application/xml": _parse_xml,
+    "text/html": _parse_text,
+}
+
+
 def gateway_property(
         _func: Callable | None = None,
         **kwargs: dict,
@@ -46,6 +72,7 @@ def gateway_property(
     """
     required_endpoint = kwargs.pop("required_endpoint", None)
     cache = kwargs.pop("cache", 0)
+    memoize = kwargs.pop("memoize", False)
 
     def decorator(func):
         return PropertyDescriptor(
@@ -53,6 +80,7 @@ def gateway_property(
             doc=None,
             required_endpoint=required_endpoint,
             cache=cache,
+            memoize=memoize,
         )
 
     return decorator if _func is None else decorator(_func)
@@ -143,6 +171,7 @@ class BaseGateway:
         """Initialize instance of BaseGateway."""
         self.data = {}
         self.gateway_info = gateway_info
+        self._descriptor_cache = {}
         self.initial_update_finished = False
         self._required_endpoints = None
         self._probes_finished = False
@@ -155,11 +184,7 @@ class BaseGateway:
     @property
     def all_values(self) -> dict:
         """Return a dict containing all attributes and their value."""
-        result = {}
-        for attr in self.properties:
-            result[attr] = getattr(self, attr)
-
-        return result
+        return {attr: getattr(self, attr) for attr in self.properties}
 
     @property
     def required_endpoints(self) -> list[GatewayEndpoint]:
@@ -185,7 +210,7 @@ class BaseGateway:
             elif endpoint.cache < _endpoint.cache:
                 _endpoint.cache = endpoint.cache
 
-        _LOGGER.debug(f"Registered properties: {self._gateway_properties}")
+        _LOGGER.debug("Registered properties: %s", self._gateway_properties)
         for prop, prop_endpoint in self._gateway_properties.items():
             if isinstance(prop_endpoint, GatewayEndpoint):
 
@@ -195,7 +220,8 @@ class BaseGateway:
                     # so we do not require it.
                     if (val := getattr(self, prop)) in (None, [], {}):
                         _LOGGER.debug(
-                            f"Skip property: {prop} : {prop_endpoint} : {val}"
+                            "Skip property: %s : %s : %s",
+                            prop, prop_endpoint, val,
                         )
                         continue
 
@@ -231,6 +257,12 @@ class BaseGateway:
         response : httpx.Response
             HTTP response object.
 
+        Raises
+        ------
+        GatewayResponseError
+            If the response exceeds MAX_RESPONSE_SIZE. The endpoint keeps
+            its previous data and is not marked as updated.
+
         Returns
         -------
         None.
@@ -239,27 +271,31 @@ class BaseGateway:
         if response.status_code >= 400:
             return
 
+        if (size := len(response.content)) > MAX_RESPONSE_SIZE:
+            raise GatewayResponseError(
+                f"Response of endpoint {endpoint} is too large: "
+                f"{size} bytes exceed the limit of {MAX_RESPONSE_SIZE}"
+            )
+
         content_type = response.headers.get("content-type", "application/json")
-        _LOGGER.debug(
-            f"Setting endpoint data: {endpoint} : {response.content}"
-        )
-        if content_type == "application/json":
-            self.data[endpoint.path] = response.json()
-        elif content_type in ("text/xml", "application/xml"):
-            self.data[endpoint.path] = xmltodict.parse(response.text)
-        elif content_type == "text/html":
-            self.data[endpoint.path] = response.text
-        else:
-            self.data[endpoint.path] = response.text
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Setting endpoint data: %s : %s", endpoint, response.content
+            )
+        parser = CONTENT_PARSERS.get(content_type, _parse_text)
+        self.data[endpoint.path] = parser(response)
 
     def run_probes(self):
         """Run all registered probes of the gateway."""
-        _LOGGER.debug(f"Registered probes: {self._gateway_probes.keys()}")
-        for probe in self._gateway_probes.keys():
+        _LOGGER.debug("Registered probes: %s", self._gateway_probes)
+        for probe in self._gateway_probes:
             func = getattr(self, probe)
             func()
             self._probes_finished = True
 
+        # Probes may change what the properties resolve to.
+        self._descriptor_cache.clear()
+
     def __getattribute__(self, name):
         """Return None if gateway does not support this property."""
         try:
@@ -337,7 +373,10 @@ class Envoy(BaseGateway):
 
     lifetime_production = JsonDescriptor("wattHoursLifetime", _ENDPOINT)
 
-    @gateway_property(required_endpoint=_ENDPOINT + "/inverters")
+    @gateway_property(
+        required_endpoint=_ENDPOINT + "/inverters",
+        memoize=True,
+    )
     def inverters_production(self):
         """Single inverter production data."""
         data = self.data.get(self._ENDPOINT + "/inverters")
@@ -360,7 +399,10 @@ class EnvoyS(Envoy):
 
     ensemble_power = JsonDescriptor("devices:", "ivp/ensemble/power")
 
-    @gateway_property(required_endpoint="ivp/ensemble/inventory")
+    @gateway_property(
+        required_endpoint="ivp/ensemble/inventory",
+        memoize=True,
+    )
     def encharge_inventory(self):
         """Ensemble inventory data.
 
@@ -377,7 +419,10 @@ class EnvoyS(Envoy):
 
         return None
 
-    @gateway_property(required_endpoint="ivp/ensemble/power")
+    @gateway_property(
+        required_endpoint="ivp/ensemble/power",
+        memoize=True,
+    )
     def encharge_power(self):
         """Ensemble inventory data.
 
@@ -391,6 +436,25 @@ class EnvoyS(Envoy):
 
         return None
 
+    @gateway_property(
+        required_endpoint="ivp/ensemble/power",
+        memoize=True,
+    )
+    def ensemble_power_totals(self):
+        """Aggregated power of all ensemble power devices."""
+        data = self.ensemble_power
+        if isinstance(data, list) and len(data) > 0:
+            return {
+                "real_power_mw": sum(
+                    device["real_power_mw"] for device in data
+                ),
+                "apparent_power_mva": sum(
+                    device["apparent_power_mva"] for device in data
+                ),
+            }
+
+        return None
+
     # @gateway_property(required_endpoint="ivp/ensemble/secctrl")
     # def ensemble_secctrl(self):
     #     """Ensemble secctrl data."""
@@ -427,7 +491,10 @@ class EnvoyS(Envoy):
     #     result = JsonDescriptor.resolve("ensemble_secctrl", self.data)
     #     return result if result else self._default
 
-    @gateway_property(required_endpoint="production.json")
+    @gateway_property(
+        required_endpoint="production.json",
+        memoize=True,
+    )
     def acb_storage(self):
         """ACB storage data."""
         data = self.data.get("production.json", {})
@@ -437,8 +504,8 @@ class EnvoyS(Envoy):
     @gateway_property
     def battery_storage(self):
         """Battery storage data."""
-        ensemble_storage = self.ensemble_inventory
-        acb_storage = self.acb_storage
+        ensemble_storage = self.encharge_inventory or {}
+        acb_storage = self.acb_storage or {}
         return ensemble_storage | acb_storage
 
 
@@ -485,19 +552,18 @@ class EnvoySMetered(EnvoyS):
     @gateway_probe(required_endpoint="ivp/meters")
     def ivp_meters_probe(self):
         """Probe the meter configuration."""
-        base_expr = "$.[?(@.state=='enabled' && @.measurementType=='{}')].eid"
-        self.production_meter = JsonDescriptor.resolve(
-            base_expr.format("production"),
-            self.data.get("ivp/meters", {}),
-        )
-        self.net_consumption_meter = JsonDescriptor.resolve(
-            base_expr.format("net-consumption"),
-            self.data.get("ivp/meters", {}),
-        )
-        self.total_consumption_meter = JsonDescriptor.resolve(
-            base_expr.format("total-consumption"),
-            self.data.get("ivp/meters", {}),
-        )
+        data = self.data.get("ivp/meters")
+        if not isinstance(data, list):
+            data = []
+        # Collect the eids of all enabled meters in a single pass.
+        meters = {
+            meter.get("measurementType"): meter.get("eid")
+            for meter in data
+            if isinstance(meter, dict) and meter.get("state") == "enabled"
+        }
+        self.production_meter = meters.get("production")
+        self.net_consumption_meter = meters.get("net-consumption")
+        self.total_consumption_meter = meters.get("total-consumption")
         _LOGGER.debug("Probe: 'ivp_meters_probe' finished")
 
     # @gateway_property(required_endpoint="ivp/meters/readings")
@@ -548,7 +614,10 @@ class EnvoySMetered(EnvoyS):
 
     #     return None
 
-    @gateway_property(required_endpoint="ivp/meters/readings")
+    @gateway_property(
+        required_endpoint="ivp/meters/readings",
+        memoize=True,
+    )
     def production(self):
         """Return the measured active power."""
         return JsonDescriptor.resolve(
@@ -556,7 +625,11 @@ class EnvoySMetered(EnvoyS):
             self.data.get("ivp/meters/readings", {})
         )
 
-    @gateway_property(required_endpoint="production.json", cache=0)
+    @gateway_property(
+        required_endpoint="production.json",
+        cache=0,
+        memoize=True,
+    )
     def daily_production(self):
         """Return the daily energy production."""
         return JsonDescriptor.resolve(
@@ -564,7 +637,11 @@ class EnvoySMetered(EnvoyS):
             self.data.get("production.json", {})
         )
 
-    @gateway_property(required_endpoint="production.json", cache=0)
+    @gateway_property(
+        required_endpoint="production.json",
+        cache=0,
+        memoize=True,
+    )
     def seven_days_production(self):
         """Return the daily energy production."""
         return JsonDescriptor.resolve(
@@ -572,7 +649,10 @@ class EnvoySMetered(EnvoyS):
             self.data.get("production.json", {}),
         )
 
-    @gateway_property(required_endpoint="ivp/meters/readings")
+    @gateway_property(
+        required_endpoint="ivp/meters/readings",
+        memoize=True,
+    )
     def lifetime_production(self):
         """Return the lifetime energy production."""
         return JsonDescriptor.resolve(
@@ -580,7 +660,10 @@ class EnvoySMetered(EnvoyS):
             self.data.get("ivp/meters/readings", {})
         )
 
-    @gateway_property(required_endpoint="ivp/meters/readings")
+    @gateway_property(
+        required_endpoint="ivp/meters/readings",
+        memoize=True,
+    )
     def consumption(self):
         """Return the measured active power."""
         if eid := self.net_consumption_meter:
@@ -599,7 +682,11 @@ class EnvoySMetered(EnvoyS):
 
         return None
 
-    @gateway_property(required_endpoint="production.json", cache=0)
+    @gateway_property(
+        required_endpoint="production.json",
+        cache=0,
+        memoize=True,
+    )
     def daily_consumption(self):
         """Return the daily energy production."""
         return JsonDescriptor.resolve(
@@ -607,7 +694,11 @@ class EnvoySMetered(EnvoyS):
             self.data.get("production.json", {})
         )
 
-    @gateway_property(required_endpoint="production.json", cache=0)
+    @gateway_property(
+        required_endpoint="production.json",
+        cache=0,
+        memoize=True,
+    )
     def seven_days_consumption(self):
         """Return the daily energy production."""
         return JsonDescriptor.resolve(
@@ -615,7 +706,10 @@ class EnvoySMetered(EnvoyS):
             self.data.get("production.json", {}),
         )
 
-    @gateway_property(required_endpoint="ivp/meters/readings")
+    @gateway_property(
+        required_endpoint="ivp/meters/readings",
+        memoize=True,
+    )
     def lifetime_consumption(self):
         """Return the lifetime energy production."""
         if eid := self.net_consumption_meter:
@@ -685,35 +779,49 @@ class EnvoySMeteredCtDisabled(EnvoyS):
         self.net_consumption_meter = net_consumption_meter
         self.total_consumption_meter = total_consumption_meter
         self.prod_type = "eim" if production_meter else "inverters"
+        # The production type is fixed, so the expression is built once.
+        self._production_expr = self._PRODUCTION.format(self.prod_type)
 
-    @gateway_property(required_endpoint="production.json")
+    @gateway_property(
+        required_endpoint="production.json",
+        memoize=True,
+    )
     def production(self):
         """Energy production."""
         return JsonDescriptor.resolve(
-            self._PRODUCTION.format(self.prod_type) + ".wNow",
+            self._production_expr + ".wNow",
             self.data.get("production.json", {})
         )
 
-    @gateway_property(required_endpoint="production.json")
+    @gateway_property(
+        required_endpoint="production.json",
+        memoize=True,
+    )
     def daily_production(self):
         """Todays energy production."""
         return JsonDescriptor.resolve(
-            self._PRODUCTION.format(self.prod_type) + ".whToday",
+            self._production_expr + ".whToday",
             self.data.get("production.json", {})
         )
 
-    @gateway_property(required_endpoint="production.json")
+    @gateway_property(
+        required_endpoint="production.json",
+        memoize=True,
+    )
     def seven_days_production(self):
         """Last seven days energy production."""
         return JsonDescriptor.resolve(
-            self._PRODUCTION.format(self.prod_type) + ".whLastSevenDays",
+            self._production_expr + ".whLastSevenDays",
             self.data.get("production.json", {})
         )
 
-    @gateway_property(required_endpoint="production.json")
+    @gateway_property(
+        required_endpoint="production.json",
+        memoize=True,
+    )
     def lifetime_production(self):
         """Lifetime energy production."""
         return JsonDescriptor.resolve(
-            self._PRODUCTION.format(self.prod_type) + ".whLifetime",
+            self._production_expr + ".whLifetime",
             self.data.get("production.json", {})
         )
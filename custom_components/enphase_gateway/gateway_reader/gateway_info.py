@@ -72,24 +72,22 @@ class GatewayInfo:
             )
         else:
             xml = etree.fromstring(response.content)
-            if (device_tag := xml.find("device")) is not None:
-                # software version
-                if (software_tag := device_tag.find("software")) is not None:
-                    self.firmware_version = AwesomeVersion(
-                        software_tag.text[1:]  # remove the leading letter
-                    )
-                # serial number
-                if (sn_tag := device_tag.find("sn")) is not None:
-                    self.serial_number = sn_tag.text
-                # part number
-                if (pn_tag := device_tag.find("pn")) is not None:
-                    self.part_number = pn_tag.text
-                # imeter
-                if (imeter_tag := device_tag.find("imeter")) is not None:
-                    self.imeter = imeter_tag.text
-
-            if (web_tokens_tag := xml.find("web-tokens")) is not None:
-                self.web_tokens = web_tokens_tag.text
+            # software version
+            if (software := xml.findtext("device/software")) is not None:
+                # remove the leading letter
+                self.firmware_version = AwesomeVersion(software[1:])
+            # serial number
+            if (serial_number := xml.findtext("device/sn")) is not None:
+                self.serial_number = serial_number
+            # part number
+            if (part_number := xml.findtext("device/pn")) is not None:
+                self.part_number = part_number
+            # imeter
+            if (imeter := xml.findtext("device/imeter")) is not None:
+                self.imeter = imeter
+
+            if (web_tokens := xml.findtext("web-tokens")) is not None:
+                self.web_tokens = web_tokens
 
             self._last_fetch = time.time()
             self.populated = True
@@ -97,10 +95,11 @@ class GatewayInfo:
     async def _get_info(self) -> httpx.Response:
         """Fetch response from the info endpoint."""
         try:
+            # Don't retry HTTPS, a failing connection falls back to HTTP.
             return await async_get(
                 self._async_client,
                 f"https://{self._host}/info",
-                retries=1,
+                retries=0,
             )
         except (httpx.ConnectError, httpx.TimeoutException):
             # Firmware < 7.0.0 does not support HTTPS so we need to try HTTP
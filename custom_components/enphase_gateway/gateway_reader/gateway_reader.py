@@ -1,5 +1,6 @@
 """Read parameters from an Enphase(R) gateway on your local network."""
 
+import asyncio
 import logging
 from collections.abc import Iterable
 
@@ -7,7 +8,7 @@ import httpx
 from awesomeversion import AwesomeVersion
 from envoy_utils.envoy_utils import EnvoyUtils
 
-from .http import async_get
+from .http import async_get, HTTP2_AVAILABLE
 from .endpoint import GatewayEndpoint
 from .utils import is_ipv6_address
 from .gateway import EnvoyLegacy, Envoy, EnvoyS, EnvoySMetered
@@ -19,6 +20,17 @@ from .exceptions import GatewayAuthenticationRequired, GatewaySetupError
 
 _LOGGER = logging.getLogger(__name__)
 
+# Gateway models by the imeter value of the info endpoint.
+IMETER_MODELS = {"true": EnvoySMetered, "false": EnvoyS}
+
+# Timeout of a single endpoint request. The gateway is on the local
+# network, so an unreachable gateway should fail fast on connect.
+ENDPOINT_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+# Maximum number of concurrent endpoint requests. The gateway is an
+# embedded device, so the concurrent updates are bounded.
+MAX_CONCURRENT_REQUESTS = 4
+
 
 class GatewayReader:
     """Class to retrieve data from an Enphase gateway.
@@ -29,6 +41,10 @@ class GatewayReader:
         Hostname of the Gateway.
     async_client : httpx.AsyncClient, optional
         httpx async client. A client will be created if no client is provided.
+        The reader only closes clients it has created itself.
+    enlighten_client : httpx.AsyncClient, optional
+        httpx async client used to communicate with Enlighten. Passed on to
+        EnphaseTokenAuth, which creates its own client if none is provided.
 
     Attributes
     ----------
@@ -41,10 +57,24 @@ class GatewayReader:
 
     """
 
+    __slots__ = (
+        "host",
+        "auth",
+        "gateway",
+        "_model_info",
+        "_owns_client",
+        "_async_client",
+        "_enlighten_client",
+        "_info",
+        "_etags",
+        "_request_semaphore",
+    )
+
     def __init__(
             self,
             host: str,
             async_client: httpx.AsyncClient | None = None,
+            enlighten_client: httpx.AsyncClient | None = None,
     ) -> None:
         """Initialize instance of GatewayReader."""
         self.host = host.lower()
@@ -52,8 +82,13 @@ class GatewayReader:
             self.host = f"[{self.host}]"
         self.auth = None
         self.gateway = None
+        self._model_info = None
+        self._owns_client = async_client is None
         self._async_client = async_client or self._get_async_client()
+        self._enlighten_client = enlighten_client
         self._info = GatewayInfo(self.host, self._async_client)
+        self._etags = {}
+        self._request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
 
     @property
     def name(self) -> str | None:
@@ -91,16 +126,17 @@ class GatewayReader:
 
         """
         await self._info.update()
-        await self._detect_model()
+        self._detect_model()
         _LOGGER.debug(
-            "Gateway info: "
-            + f"part_number: {self._info.part_number}, "
-            + f"firmware_version: {self._info.firmware_version}, "
-            + f"imeter: {self._info.imeter}, "
-            + f"web_tokens: {self._info.web_tokens}"
+            "Gateway info: part_number: %s, firmware_version: %s, "
+            "imeter: %s, web_tokens: %s",
+            self._info.part_number,
+            self._info.firmware_version,
+            self._info.imeter,
+            self._info.web_tokens,
         )
         _LOGGER.debug(
-            f"Initial Gateway class: {self.gateway.__class__.__name__}"
+            "Initial Gateway class: %s", self.gateway.__class__.__name__
         )
 
     async def update(
@@ -108,20 +144,29 @@ class GatewayReader:
         limit_endpoints: Iterable[str] | None = None
     ) -> None:
         """Update the gateway reader."""
-        await self._info.update()
-        await self.auth.update(self._async_client)
-        await self.update_endpoints(limit_endpoints=limit_endpoints)
+        if self.auth.update_required:
+            await self.auth.update(self._async_client)
+        # The info endpoint is only refreshed once a day. It doesn't depend
+        # on the other endpoints, so it is fetched alongside them.
+        if self._info.update_required:
+            await asyncio.gather(
+                self._info.update(),
+                self.update_endpoints(limit_endpoints=limit_endpoints),
+            )
+        else:
+            await self.update_endpoints(limit_endpoints=limit_endpoints)
 
         if self.gateway.initial_update_finished is False:
             self.gateway.run_probes()
             if subclass := self.gateway.get_subclass():
+                # Reuse the responses fetched for the detection and only
+                # fetch the endpoints the subclass is missing.
+                subclass.data.update(self.gateway.data)
                 self.gateway = subclass
-                await self.update_endpoints(
-                    limit_endpoints=limit_endpoints,
-                    force_update=True,
-                )
+                self._etags.clear()
+                await self.update_endpoints(limit_endpoints=limit_endpoints)
 
-            _LOGGER.debug(f"Gateway class: {self.gateway.__class__.__name__}")
+            _LOGGER.debug("Gateway class: %s", self.gateway.__class__.__name__)
             self.gateway.initial_update_finished = True
 
     async def authenticate(
@@ -152,25 +197,24 @@ class GatewayReader:
                     cache_token=cache_token,
                     cache_filepath=cache_path,
                     auto_renewal=auto_renewal,
+                    enlighten_client=self._enlighten_client,
                 )
         else:
             _LOGGER.debug("Using envoy/installer authentication.")
             if not username or username == "installer":
-                username = "installer"  # FIXME: fix legacy auth
+                username = "installer"
                 password = EnvoyUtils.get_password(
                     self._info.serial_number,
                     username
                 )
             elif username == "envoy" and not password:
-                password = self._info.serial_number[:6]
-            elif username and password:
-                self.auth = LegacyAuth(
-                    self.host,
-                    username,
-                    self._info.serial_number
-                )
+                # default password: last 6 digits of the serial number
+                password = self._info.serial_number[-6:]
+
+            if username and password:
+                self.auth = LegacyAuth(self.host, username, password)
         _LOGGER.debug(
-            f"Using authentication class: {self.auth.__class__.__name__}"
+            "Using authentication class: %s", self.auth.__class__.__name__
         )
         if not self.auth:
             _LOGGER.error(
@@ -183,26 +227,53 @@ class GatewayReader:
 
         await self.auth.update(self._async_client)
 
-    async def _detect_model(self) -> None:
+    async def aclose(self) -> None:
+        """Release the resources held by the gateway reader."""
+        if self.auth:
+            await self.auth.aclose()
+        if self._owns_client:
+            await self._async_client.aclose()
+
+    def _detect_model(self) -> None:
         """Detect the Enphase gateway model.
 
         Detect gateway model based on info.xml parmeters.
+        The detected gateway is kept as long as these parameters don't
+        change, so a re-authentication doesn't discard the probed gateway
+        class and its data.
 
         """
+        model_info = (self._info.firmware_version, self._info.imeter)
+        if self.gateway and model_info == self._model_info:
+            return
+
+        self._model_info = model_info
         if self.firmware_version < LEGACY_ENVOY_VERSION:
-            self.gateway = EnvoyLegacy()
-        elif self._info.imeter and self._info.imeter == "true":
-            self.gateway = EnvoySMetered()
-        elif self._info.imeter and self._info.imeter == "false":
-            self.gateway = EnvoyS()
+            gateway_class = EnvoyLegacy
         else:
-            self.gateway = Envoy()
+            gateway_class = IMETER_MODELS.get(self._info.imeter, Envoy)
+
+        self.gateway = gateway_class()
+        # The ETags belong to the data of the replaced gateway.
+        self._etags.clear()
 
     def _get_async_client(self) -> httpx.AsyncClient:
-        """Return default httpx client."""
+        """Return default httpx client.
+
+        The client is kept for the lifetime of the reader, so the
+        connections to the gateway are pooled and kept alive. HTTP/2 is
+        negotiated if available, which lets the concurrent endpoint
+        requests share a single connection.
+
+        """
         return httpx.AsyncClient(
             verify=False,
-            timeout=10
+            timeout=10,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_keepalive_connections=10,
+                max_connections=20,
+            ),
         )
 
     async def update_endpoints(
@@ -210,52 +281,120 @@ class GatewayReader:
             limit_endpoints: Iterable[str] | None = None,
             force_update: bool = False,
     ) -> None:
-        """Update endpoints."""
-        endpoints = self.gateway.required_endpoints
-        _LOGGER.debug(f"Updating endpoints: {endpoints}")
-        for endpoint in endpoints:
-            # TODO: fix below line breaking integration
-            # if limit_endpoints and endpoint.path not in limit_endpoints:
-            #     continue
-            if endpoint.update_required or force_update is True:
-                await self._update_endpoint(endpoint)
+        """Update endpoints.
+
+        The endpoints are fetched concurrently, with at most
+        MAX_CONCURRENT_REQUESTS requests at a time. A failing endpoint does
+        not abort the others; the first error is raised once all requests
+        have finished. A single endpoint is awaited directly.
+
+        """
+        # TODO: fix limit_endpoints breaking integration
+        # if limit_endpoints and endpoint.path not in limit_endpoints:
+        #     continue
+        endpoints = [
+            endpoint for endpoint in self.gateway.required_endpoints
+            if endpoint.update_required or force_update is True
+        ]
+        _LOGGER.debug("Updating endpoints: %s", endpoints)
+        if len(endpoints) == 1:
+            # No need to wrap a single request into a task.
+            await self._update_endpoint(endpoints[0])
+            endpoints[0].success()
+            return
+
+        results = await asyncio.gather(
+            *[self._update_endpoint(endpoint) for endpoint in endpoints],
+            return_exceptions=True,
+        )
+        error = None
+        for endpoint, result in zip(endpoints, results):
+            if isinstance(result, BaseException):
+                _LOGGER.debug(
+                    "Error updating endpoint: %s: %r", endpoint, result
+                )
+                error = error or result
+            else:
                 endpoint.success()
 
+        if error:
+            raise error
+
     async def _update_endpoint(self, endpoint: GatewayEndpoint) -> None:
-        """Fetch a single endpoint and store the response."""
-        formatted_url = endpoint.get_url(self.auth.protocol, self.host)
-        response = await self._async_get(
-            formatted_url,
-            follow_redirects=False
-        )
-        if self.gateway:
-            self.gateway.set_endpoint_data(endpoint, response)
+        """Fetch a single endpoint and store the response.
+
+        If the gateway sent an ETag for stored endpoint data, the request
+        is made conditional. A 304 Not Modified response keeps the stored
+        data. If there is no stored data to keep, the ETag is dropped and
+        the endpoint is fetched again unconditionally.
 
-    async def _async_get(self, url: str, handle_401: bool = True, **kwargs):
-        """Make a HTTP GET request to the gateway."""
+        """
+        formatted_url = endpoint.get_url(self.auth.protocol, self.host)
+        headers = None
+        if etag := self._etags.get(endpoint.path):
+            headers = {"If-None-Match": etag}
         try:
-            resp = await async_get(
-                self._async_client,
-                url,
-                headers=self.auth.headers,
-                cookies=self.auth.cookies,
-                auth=self.auth.auth,
-                **kwargs
-            )
+            async with self._request_semaphore:
+                response = await self._async_get(
+                    formatted_url,
+                    follow_redirects=False,
+                    timeout=ENDPOINT_TIMEOUT,
+                    headers=headers,
+                )
         except httpx.HTTPStatusError as err:
-            _LOGGER.debug(
-                f"Gateway returned status code: {err.response.status_code}"
-            )
-            if err.response.status_code == 401 and handle_401:
-                _LOGGER.debug("Trying to resolve 401 error")
-                self.auth.resolve_401(self._async_client)
-                return await self._async_get(
+            if err.response.status_code != 304:
+                raise err
+            if self.gateway and endpoint.path in self.gateway.data:
+                return
+            self._etags.pop(endpoint.path, None)
+            await self._update_endpoint(endpoint)
+            return
+
+        if not self.gateway:
+            return
+        self.gateway.set_endpoint_data(endpoint, response)
+        # Only remember the ETag of data that has actually been stored.
+        if endpoint.path in self.gateway.data:
+            if etag := response.headers.get("etag"):
+                self._etags[endpoint.path] = etag
+            else:
+                self._etags.pop(endpoint.path, None)
+
+    async def _async_get(
+            self,
+            url: str,
+            handle_401: bool = True,
+            headers: dict[str, str] | None = None,
+            **kwargs
+    ):
+        """Make a HTTP GET request to the gateway.
+
+        A 401 response is resolved once by the authentication class before
+        the request is retried. Extra headers are merged into the headers
+        of the authentication class.
+
+        """
+        while True:
+            request_headers = self.auth.headers
+            if headers:
+                request_headers = request_headers | headers
+            try:
+                return await async_get(
+                    self._async_client,
                     url,
-                    handle_401=False,
+                    headers=request_headers,
+                    cookies=self.auth.cookies,
+                    auth=self.auth.auth,
                     **kwargs
                 )
-            else:
-                raise err
+            except httpx.HTTPStatusError as err:
+                _LOGGER.debug(
+                    "Gateway returned status code: %s",
+                    err.response.status_code,
+                )
+                if err.response.status_code != 401 or not handle_401:
+                    raise err
 
-        else:
-            return resp
+                _LOGGER.debug("Trying to resolve 401 error")
+                await self.auth.resolve_401(self._async_client)
+                handle_401 = False
@@ -1,19 +1,98 @@
 """Async http methods."""
 
+import ssl
+import random
 import asyncio
 import logging
+from functools import lru_cache
+from importlib.util import find_spec
 
 import httpx
+import certifi
 
 
 _LOGGER = logging.getLogger(__name__)
 
+MAX_BACKOFF_FACTOR = 8
+
+# Upper bound of a Retry-After delay that is honored (seconds). Longer
+# delays are not waited for, so a poll doesn't stall.
+MAX_RETRY_AFTER = 5
+
+# httpx only supports HTTP/2 if the optional 'h2' package is installed.
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+
+@lru_cache(maxsize=1)
+def get_ssl_context() -> ssl.SSLContext:
+    """Return the verifying SSL context shared by all clients.
+
+    Loading the CA bundle is expensive, so the context is created once on
+    first use instead of at import time.
+
+    """
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+def backoff_delay(
+        attempt: int,
+        backoff_base: float = 2,
+        backoff_interval: float = 0.1,
+) -> float:
+    """Return the delay in seconds before the next retry.
+
+    Exponential backoff with full jitter: the delay is drawn uniformly
+    from [0, min(backoff_base ** attempt, MAX_BACKOFF_FACTOR)] and scaled
+    by backoff_interval.
+
+    """
+    factor = min(backoff_base ** attempt, MAX_BACKOFF_FACTOR)
+    return random.uniform(0, factor) * backoff_interval
+
+
+def _is_retryable(err: httpx.HTTPError) -> bool:
+    """Return True if the request failing with err should be retried."""
+    if isinstance(err, httpx.HTTPStatusError):
+        status_code = err.response.status_code
+        if status_code in (429, 503):
+            return _retry_after(err.response) <= MAX_RETRY_AFTER
+        return status_code >= 500
+    return isinstance(err, httpx.TransportError)
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """Return the delay in seconds requested by the Retry-After header.
+
+    Only the delay-seconds form is supported. Returns 0 if the header is
+    missing or an HTTP date.
+
+    """
+    try:
+        return max(float(response.headers.get("retry-after", 0)), 0)
+    except ValueError:
+        return 0
+
+
+def _retry_delay(
+        err: httpx.HTTPError,
+        attempt: int,
+        backoff_base: float,
+        backoff_interval: float,
+) -> float:
+    """Return the delay in seconds before retrying the failed request."""
+    delay = backoff_delay(attempt, backoff_base, backoff_interval)
+    if isinstance(err, httpx.HTTPStatusError):
+        delay = max(delay, _retry_after(err.response))
+    return delay
+
 
 async def async_get(
         async_client: httpx.AsyncClient,
         url: str,
         retries: int = 2,
         raise_for_status: bool = True,
+        backoff_base: float = 2,
+        backoff_interval: float = 0.1,
         **kwargs
 ) -> httpx.Response:
     """Send a HTTP GET request using httpx.
@@ -25,9 +104,16 @@ async def async_get(
     async_client : httpx.AsyncClient
         Async client.
     retries : int, optional
-        Number of retries in case of a transport error. The default is 2.
+        Number of retries in case of a transport error, a 429 or a 5xx
+        response. A Retry-After delay of up to MAX_RETRY_AFTER seconds
+        is honored.
+        The default is 2.
     raise_for_status : bool, optional
         If True call raise_for_status on the response. The default is True.
+    backoff_base : float, optional
+        Base of the exponential backoff. The default is 2.
+    backoff_interval : float, optional
+        Backoff interval in seconds. The default is 0.1.
     **kwargs : dict, optional
         Extra arguments to httpx.AsyncClient.get(**kwargs).
 
@@ -35,6 +121,8 @@ async def async_get(
     ------
     err : httpx.TransportError
         Transport error.
+    err : httpx.HTTPStatusError
+        HTTP status error.
 
     Returns
     -------
@@ -43,21 +131,26 @@ async def async_get(
 
     """
     for attempt in range(1, retries+2):
-        _base_msg = f"HTTP GET Attempt #{attempt}: {url}"
         try:
             resp = await async_client.get(url, **kwargs)
             if raise_for_status:
                 resp.raise_for_status()
-        except httpx.TransportError as err:
-            if attempt >= retries+1:
-                _LOGGER.debug(f"{_base_msg}: Transport Error: {err}")
+        except (httpx.TransportError, httpx.HTTPStatusError) as err:
+            if attempt >= retries+1 or not _is_retryable(err):
+                _LOGGER.debug(
+                    "HTTP GET Attempt #%s: %s: %s: %s",
+                    attempt, url, err.__class__.__name__, err
+                )
                 raise err
             else:
-                await asyncio.sleep(attempt * 0.10)
+                await asyncio.sleep(
+                    _retry_delay(err, attempt, backoff_base, backoff_interval)
+                )
                 continue
         else:
             _LOGGER.debug(
-                f"{_base_msg}: Response: {resp}: length: {len(resp.text)}"
+                "HTTP GET Attempt #%s: %s: Response: %s: length: %s",
+                attempt, url, resp, len(resp.content)
             )
             return resp
 
@@ -67,6 +160,8 @@ async def async_post(
         url: str,
         retries: int = 2,
         raise_for_status: bool = True,
+        backoff_base: float = 2,
+        backoff_interval: float = 0.1,
         **kwargs,
 ) -> httpx.Response:
     """Send a HTTP POST request using httpx.
@@ -78,9 +173,16 @@ async def async_post(
     async_client : httpx.AsyncClient
         Async client.
     retries : int, optional
-        Number of reties in case of a transport error. The default is 2.
+        Number of retries in case of a transport error, a 429 or a 5xx
+        response. A Retry-After delay of up to MAX_RETRY_AFTER seconds
+        is honored.
+        The default is 2.
     raise_for_status : bool, optional
         If True call raise_for_status on the response. The default is True.
+    backoff_base : float, optional
+        Base of the exponential backoff. The default is 2.
+    backoff_interval : float, optional
+        Backoff interval in seconds. The default is 0.1.
     **kwargs : dict, optional
         Extra arguments to httpx.AsyncClient.get(**kwargs).
 
@@ -91,23 +193,25 @@ async def async_post(
 
     """
     for attempt in range(1, retries+2):
-        _base_msg = f"HTTP GET Attempt #{attempt}: {url}"
         try:
             resp = await async_client.post(url, **kwargs)
-            _LOGGER.debug(
-                f"Response: HTTP POST #{attempt}: {resp}: {resp.text}"
-            )
             if raise_for_status:
                 resp.raise_for_status()
-        except httpx.TransportError as err:
-            if attempt >= retries+1:
-                _LOGGER.debug(f"{_base_msg}: Transport Error: {err}")
+        except (httpx.TransportError, httpx.HTTPStatusError) as err:
+            if attempt >= retries+1 or not _is_retryable(err):
+                _LOGGER.debug(
+                    "HTTP POST Attempt #%s: %s: %s: %s",
+                    attempt, url, err.__class__.__name__, err
+                )
                 raise err
             else:
-                await asyncio.sleep(attempt * 0.10)
+                await asyncio.sleep(
+                    _retry_delay(err, attempt, backoff_base, backoff_interval)
+                )
                 continue
         else:
             _LOGGER.debug(
-                f"{_base_msg}: Response: {resp}: length: {len(resp.text)}"
+                "HTTP POST Attempt #%s: %s: Response: %s: length: %s",
+                attempt, url, resp, len(resp.content)
             )
             return resp
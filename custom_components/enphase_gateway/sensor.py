@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import logging
+from datetime import datetime
+from functools import lru_cache
 
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
@@ -29,6 +31,17 @@ from .coordinator import GatewayReaderUpdateCoordinator
 _LOGGER = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=128)
+def _utc_from_timestamp(timestamp: float) -> datetime:
+    """Return a cached UTC datetime for the given timestamp.
+
+    The inverters usually report at the same time, so most of them share
+    the same lastReportDate.
+
+    """
+    return dt_util.utc_from_timestamp(timestamp)
+
+
 INVERTER_SENSORS = (
     SensorEntityDescription(
         key="lastReportWatts",
@@ -397,7 +410,8 @@ async def async_setup_entry(
             for encharge in data
         )
 
-    _LOGGER.debug(f"Adding entities: {entities}")
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug("Adding %s entities: %s", len(entities), entities)
     async_add_entities(entities)
 
 
@@ -475,7 +489,7 @@ class GatewaySensorInverterEntity(GatewaySystemSensorEntity):
         if data is not None:
             inv = data.get(self._serial_number)
             if last_reported := inv.get("lastReportDate"):
-                dt = dt_util.utc_from_timestamp(last_reported)
+                dt = _utc_from_timestamp(last_reported)
                 return {"last_reported": dt}
 
         return None
@@ -524,7 +538,7 @@ class GatewayInverterEntity(GatewaySensorInverterEntity):
         if (data := self.data.get("inverters_production")) is not None:
             value = data.get(self._serial_number, {}).get(_key)
             if value is not None and _key == "lastReportDate":
-                return dt_util.utc_from_timestamp(value)
+                return _utc_from_timestamp(value)
             return value
 
         return None
@@ -578,13 +592,10 @@ class EnchargeAggregatedPowerEntity(GatewaySystemSensorEntity):
     @property
     def native_value(self) -> int:
         """Return the state of the sensor."""
-        data = self.data.ensemble_power
-        if isinstance(data, list) and len(data) > 0:
-            real_power_agg = 0
-            apparent_power_agg = 0
-            for device in data:
-                real_power_agg += device["real_power_mw"]
-                apparent_power_agg += device["apparent_power_mva"]
+        totals = self.data.ensemble_power_totals
+        if totals is not None:
+            real_power_agg = totals["real_power_mw"]
+            apparent_power_agg = totals["apparent_power_mva"]
 
             if self.entity_description.key == "real_power_mw":
                 return round(real_power_agg * 0.001)
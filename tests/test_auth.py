@@ -0,0 +1,136 @@
+"""Testing module for the gateway authentication."""
+
+import base64
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import respx
+import pytest
+from httpx import Response
+from envoy_utils.envoy_utils import EnvoyUtils
+
+from custom_components.enphase_gateway.gateway_reader import GatewayReader
+from custom_components.enphase_gateway.gateway_reader.auth import (
+    EnphaseTokenAuth,
+    LegacyAuth,
+    bearer_headers,
+    decode_jwt_payload,
+)
+from custom_components.enphase_gateway.gateway_reader.exceptions import (
+    GatewayAuthenticationRequired,
+    InvalidTokenError,
+)
+
+FIXTURES_DIR = Path(__file__).parent.joinpath("fixtures")
+
+# Serial number and installer password of the 3.9.36_envoy_r fixture.
+LEGACY_SERIAL_NUM = "121426016034"
+INSTALLER_PASSWORD = EnvoyUtils.get_password(LEGACY_SERIAL_NUM, "installer")
+
+
+async def get_prepared_reader(fixture_name):
+    """Get a gateway reader with the info of the fixture."""
+    info = FIXTURES_DIR.joinpath(fixture_name, "info").read_text()
+    respx.get("/info").mock(return_value=Response(200, text=info))
+    gateway_reader = GatewayReader("127.0.0.1")
+    await gateway_reader.prepare()
+    return gateway_reader
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("username", "password", "expected_username", "expected_password"),
+    [
+        (None, None, "installer", INSTALLER_PASSWORD),
+        ("installer", None, "installer", INSTALLER_PASSWORD),
+        ("envoy", None, "envoy", LEGACY_SERIAL_NUM[-6:]),
+        ("envoy", "secret", "envoy", "secret"),
+        ("user", "secret", "user", "secret"),
+    ],
+)
+@respx.mock
+async def test_legacy_auth_credentials(
+        username, password, expected_username, expected_password
+):
+    """Test the credentials chosen for gateways without token support."""
+    gateway_reader = await get_prepared_reader("3.9.36_envoy_r")
+
+    await gateway_reader.authenticate(username=username, password=password)
+
+    assert isinstance(gateway_reader.auth, LegacyAuth)
+    assert gateway_reader.auth._username == expected_username
+    assert gateway_reader.auth._password == expected_password
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_legacy_auth_requires_password():
+    """Test that a user other than installer/envoy needs a password."""
+    gateway_reader = await get_prepared_reader("3.9.36_envoy_r")
+
+    with pytest.raises(GatewayAuthenticationRequired):
+        await gateway_reader.authenticate(username="user")
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_token_auth_credentials():
+    """Test that gateways with token support use EnphaseTokenAuth."""
+    gateway_reader = await get_prepared_reader("7.6.175_envoy_s_metered")
+
+    with patch.object(EnphaseTokenAuth, "update", new_callable=AsyncMock):
+        await gateway_reader.authenticate(username="user", password="secret")
+
+    assert isinstance(gateway_reader.auth, EnphaseTokenAuth)
+    assert gateway_reader.auth._enlighten_username == "user"
+    assert gateway_reader.auth._gateway_serial_num == "122238082763"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_token_auth_requires_credentials():
+    """Test that token support without credentials or token fails."""
+    gateway_reader = await get_prepared_reader("7.6.175_envoy_s_metered")
+
+    with pytest.raises(GatewayAuthenticationRequired):
+        await gateway_reader.authenticate(username="envoy")
+
+
+def encode_jwt(payload: bytes) -> str:
+    """Return an unsigned JWT token with unpadded segments."""
+    header = base64.urlsafe_b64encode(b'{"alg":"ES256"}').rstrip(b"=")
+    body = base64.urlsafe_b64encode(payload).rstrip(b"=")
+    return f"{header.decode()}.{body.decode()}.signature"
+
+
+def test_decode_jwt_payload_with_padding():
+    """Test decoding a JWT token whose payload segment needs padding."""
+    token = encode_jwt(b'{"exp":1700000000,"username":"user1"}')
+    assert len(token.split(".")[1]) % 4 != 0
+
+    claims = decode_jwt_payload(token)
+
+    assert claims == {"exp": 1700000000, "username": "user1"}
+    with pytest.raises(TypeError):
+        claims["exp"] = 0
+
+
+def test_decode_jwt_payload_malformed():
+    """Test that a malformed JWT token raises InvalidTokenError."""
+    with pytest.raises(InvalidTokenError):
+        decode_jwt_payload("not-a-jwt")
+    with pytest.raises(InvalidTokenError):
+        decode_jwt_payload(encode_jwt(b"[1, 2]"))
+
+
+def test_bearer_headers_are_read_only():
+    """Test that the cached bearer headers can't be modified."""
+    headers = bearer_headers("token")
+
+    with pytest.raises(TypeError):
+        headers["Authorization"] = "Bearer other"
+    assert bearer_headers("token") == {"Authorization": "Bearer token"}
+    assert headers | {"If-None-Match": '"1"'} == {
+        "Authorization": "Bearer token",
+        "If-None-Match": '"1"',
+    }
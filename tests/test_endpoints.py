@@ -6,10 +6,16 @@ from pathlib import Path
 
 import respx
 import pytest
-from httpx import Response
+from httpx import Response, AsyncClient, ConnectError
 
 from custom_components.enphase_gateway.gateway_reader import GatewayReader
 from custom_components.enphase_gateway.gateway_reader.auth import LegacyAuth
+from custom_components.enphase_gateway.gateway_reader.endpoint import (
+    GatewayEndpoint,
+)
+from custom_components.enphase_gateway.gateway_reader.gateway_info import (
+    GatewayInfo,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -169,6 +175,7 @@ async def test_with_7_6_175_firmware():
     # battery data
     assert gateway.encharge_inventory is None
     assert gateway.encharge_power is None
+    assert gateway.battery_storage == {}
     # inverters
     assert gateway.inverters_production["482243031579"] == {
         "serialNumber": "482243031579",
@@ -213,6 +220,7 @@ async def test_with_7_6_175_firmware_cts_disabled():
     # battery data
     assert gateway.encharge_inventory is None
     assert gateway.encharge_power is None
+    assert gateway.battery_storage == {}
     # inverters
     assert gateway.inverters_production["122107032918"] == {
         "serialNumber": "122107032918",
@@ -221,3 +229,92 @@ async def test_with_7_6_175_firmware_cts_disabled():
         "lastReportWatts": 21,
         "maxReportWatts": 296
     }
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_info_falls_back_to_http():
+    """Test that the info endpoint falls back to HTTP.
+
+    A refused HTTPS connection must not be retried before falling back.
+
+    """
+    https_route = respx.get("https://127.0.0.1/info").mock(
+        side_effect=ConnectError("Connection refused")
+    )
+    respx.get("http://127.0.0.1/info").mock(
+        return_value=Response(200, text=load_fixture("3.9.36_envoy_r", "info"))
+    )
+
+    gateway_info = GatewayInfo("127.0.0.1", AsyncClient(verify=False))
+    await gateway_info.update()
+
+    assert https_route.call_count == 1
+    assert gateway_info.serial_number == "121426016034"
+
+
+async def get_prepared_reader(fixture_name):
+    """Get a prepared gateway reader using legacy authentication."""
+    respx.get("/info").mock(
+        return_value=Response(200, text=load_fixture(fixture_name, "info"))
+    )
+    gateway_reader = GatewayReader("127.0.0.1")
+    await gateway_reader.prepare()
+    gateway_reader.auth = LegacyAuth(
+        gateway_reader.host,
+        "username",
+        "password",
+    )
+    return gateway_reader
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_not_modified_keeps_stored_data():
+    """Test that a 304 response keeps the stored endpoint data."""
+    gateway_reader = await get_prepared_reader("3.9.36_envoy_r")
+    endpoint = GatewayEndpoint("production.json")
+    route = respx.get("/production.json").mock(
+        side_effect=[
+            Response(200, json={"production": []}, headers={"etag": '"1"'}),
+            Response(304),
+        ]
+    )
+
+    await gateway_reader._update_endpoint(endpoint)
+    await gateway_reader._update_endpoint(endpoint)
+
+    assert route.call_count == 2
+    assert route.calls[1].request.headers["If-None-Match"] == '"1"'
+    assert gateway_reader.gateway.data["production.json"] == {
+        "production": []
+    }
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_not_modified_without_stored_data_refetches():
+    """Test that a 304 response without stored data is refetched.
+
+    The refetch must not be conditional and the new ETag is kept.
+
+    """
+    gateway_reader = await get_prepared_reader("3.9.36_envoy_r")
+    gateway_reader._etags["production.json"] = '"1"'
+    endpoint = GatewayEndpoint("production.json")
+    route = respx.get("/production.json").mock(
+        side_effect=[
+            Response(304),
+            Response(200, json={"production": []}, headers={"etag": '"2"'}),
+        ]
+    )
+
+    await gateway_reader._update_endpoint(endpoint)
+
+    assert route.call_count == 2
+    assert route.calls[0].request.headers["If-None-Match"] == '"1"'
+    assert "If-None-Match" not in route.calls[1].request.headers
+    assert gateway_reader.gateway.data["production.json"] == {
+        "production": []
+    }
+    assert gateway_reader._etags["production.json"] == '"2"'
@@ -0,0 +1,90 @@
+"""Testing module for the http retry policy."""
+
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import respx
+import pytest
+from httpx import Response
+
+from custom_components.enphase_gateway.gateway_reader.http import (
+    MAX_BACKOFF_FACTOR,
+    MAX_RETRY_AFTER,
+    async_get,
+)
+
+URL = "http://127.0.0.1/production"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_retry_after_within_limit_is_retried():
+    """Test that a 429 with a short Retry-After is retried."""
+    route = respx.get(URL).mock(
+        side_effect=[
+            Response(429, headers={"retry-after": "1"}),
+            Response(200, text="ok"),
+        ]
+    )
+    with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        async with httpx.AsyncClient() as client:
+            resp = await async_get(client, URL)
+
+    assert resp.text == "ok"
+    assert route.call_count == 2
+    mock_sleep.assert_awaited_once()
+    assert mock_sleep.await_args.args[0] >= 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_retry_after_above_limit_is_raised():
+    """Test that a 429 with a long Retry-After is not waited for."""
+    route = respx.get(URL).mock(
+        return_value=Response(
+            429, headers={"retry-after": str(MAX_RETRY_AFTER + 1)}
+        )
+    )
+    with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        async with httpx.AsyncClient() as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await async_get(client, URL)
+
+    assert route.call_count == 1
+    mock_sleep.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_server_error_is_retried():
+    """Test that a 5xx response is retried with a capped backoff."""
+    route = respx.get(URL).mock(
+        side_effect=[
+            Response(500),
+            Response(502),
+            Response(200, text="ok"),
+        ]
+    )
+    with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        async with httpx.AsyncClient() as client:
+            resp = await async_get(client, URL, backoff_interval=1)
+
+    assert resp.text == "ok"
+    assert route.call_count == 3
+    assert mock_sleep.await_count == 2
+    for call in mock_sleep.await_args_list:
+        assert 0 <= call.args[0] <= MAX_BACKOFF_FACTOR
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_error_is_not_retried():
+    """Test that a 4xx response other than 429 is raised immediately."""
+    route = respx.get(URL).mock(return_value=Response(404))
+    with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        async with httpx.AsyncClient() as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await async_get(client, URL)
+
+    assert route.call_count == 1
+    mock_sleep.assert_not_awaited()